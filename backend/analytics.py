@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+ANALYTICS_BATCH_SIZE = 5000
+
+# Every write to these collections bumps its version, which invalidates cached results
+SOURCE_COLLECTIONS = ("internships", "applications", "reports", "evaluations")
+
+PROJECTIONS = {
+    "internships": {"_id": 0, "id": 1, "title": 1, "company_name": 1, "max_students": 1},
+    "applications": {"_id": 0, "internship_id": 1, "status": 1},
+    "reports": {"_id": 0, "student_id": 1, "submitted_at": 1},
+    "evaluations": {"_id": 0, "internship_id": 1, "grade": 1},
+}
+
+DECISION_STATUSES = ["pending", "approved", "rejected"]
+
+
+async def load_frame(collection, name: str) -> pd.DataFrame:
+    """Pull only the analysed fields through an aggregation cursor into column lists."""
+    columns = {field: [] for field in PROJECTIONS[name] if field != "_id"}
+    cursor = collection.aggregate([{"$project": PROJECTIONS[name]}], batchSize=ANALYTICS_BATCH_SIZE)
+    async for doc in cursor:
+        for field, values in columns.items():
+            values.append(doc.get(field))
+    return pd.DataFrame(columns)
+
+
+def _records(frame: pd.DataFrame) -> List[dict]:
+    # NaN is not valid JSON, so missing values become null
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def _grade_counts(frame: pd.DataFrame, keys: List[str]) -> List[dict]:
+    counts = frame.groupby(keys + ["grade"]).size().rename("count").reset_index()
+    rows = []
+    for key, group in counts.groupby(keys):
+        row = dict(zip(keys, key if isinstance(key, tuple) else (key,)))
+        row["total"] = int(group["count"].sum())
+        row["grades"] = dict(zip(group["grade"], group["count"].tolist()))
+        rows.append(row)
+    return rows
+
+
+def grade_distribution(evaluations: pd.DataFrame, internships: pd.DataFrame) -> Dict[str, List[dict]]:
+    if evaluations.empty:
+        return {"by_internship": [], "by_company": []}
+    frame = evaluations.merge(
+        internships[["id", "title", "company_name"]], left_on="internship_id", right_on="id", how="left"
+    )
+    frame = frame.assign(
+        internship_title=frame["title"].fillna("Unknown"),
+        company_name=frame["company_name"].fillna("Unknown"),
+        grade=frame["grade"].fillna("").astype(str),
+    )
+    return {
+        "by_internship": _grade_counts(frame, ["internship_id", "internship_title"]),
+        "by_company": _grade_counts(frame, ["company_name"]),
+    }
+
+
+def report_cadence(reports: pd.DataFrame) -> Dict[str, List[dict]]:
+    reports = reports.assign(submitted_at=pd.to_datetime(reports["submitted_at"], errors="coerce"))
+    reports = reports.dropna(subset=["student_id", "submitted_at"])
+    if reports.empty:
+        return {"weekly": [], "by_student": []}
+    reports = reports.assign(week=reports["submitted_at"].dt.to_period("W-SUN").dt.start_time)
+
+    per_week = reports.groupby(["student_id", "week"]).size()
+    by_student = per_week.groupby(level="student_id").agg(reports="sum", active_weeks="count", max_in_a_week="max")
+    grouped = reports.groupby("student_id")
+    first_week = grouped["week"].min()
+    # Weeks from the first submission's week to the last, so silent weeks pull the average down
+    span_weeks = (grouped["week"].max() - first_week).dt.days // 7 + 1
+    by_student = by_student.assign(
+        span_weeks=span_weeks,
+        reports_per_week=(by_student["reports"] / span_weeks).round(3),
+        first_submitted_at=grouped["submitted_at"].min().map(lambda value: value.isoformat()),
+        last_submitted_at=grouped["submitted_at"].max().map(lambda value: value.isoformat()),
+    ).reset_index()
+
+    weekly = per_week.groupby(level="week").agg(reports="sum", students="count").reset_index()
+    weekly["week"] = weekly["week"].dt.strftime("%Y-%m-%d")
+    return {"weekly": _records(weekly), "by_student": _records(by_student)}
+
+
+def application_outcomes(applications: pd.DataFrame, internships: pd.DataFrame) -> List[dict]:
+    if applications.empty:
+        counts = pd.DataFrame(columns=DECISION_STATUSES)
+    else:
+        counts = pd.crosstab(applications["internship_id"], applications["status"])
+    counts = counts.reindex(columns=DECISION_STATUSES, fill_value=0)
+    frame = internships.set_index("id").join(counts, how="left")
+    frame[DECISION_STATUSES] = frame[DECISION_STATUSES].fillna(0).astype(int)
+
+    approved = frame["approved"].to_numpy(dtype=float)
+    decided = approved + frame["rejected"].to_numpy(dtype=float)
+    max_students = pd.to_numeric(frame["max_students"], errors="coerce").to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["acceptance_rate"] = np.where(decided > 0, approved / decided, np.nan).round(4)
+        frame["fill_ratio"] = np.where(max_students > 0, approved / max_students, np.nan).round(4)
+    frame = frame.rename_axis("internship_id").reset_index().rename(columns={"title": "internship_title"})
+    return _records(frame[[
+        "internship_id", "internship_title", "company_name", "max_students",
+        *DECISION_STATUSES, "acceptance_rate", "fill_ratio",
+    ]])
+
+
+def compute_analytics(frames: Dict[str, pd.DataFrame]) -> dict:
+    internships = frames["internships"]
+    return {
+        "grade_distribution": grade_distribution(frames["evaluations"], internships),
+        "report_cadence": report_cadence(frames["reports"]),
+        "applications": application_outcomes(frames["applications"], internships),
+    }
+
+
+async def cohort_analytics(db, versions, cache) -> dict:
+    """Cohort-wide metrics, recomputed only when one of the source collections has changed."""
+    current = {name: await versions.get(name) for name in SOURCE_COLLECTIONS}
+    key = tuple(current.values())
+    result = cache.get(key)
+    if result is None:
+        frames = {name: await load_frame(db[name], name) for name in SOURCE_COLLECTIONS}
+        # The number crunching runs off the event loop
+        result = await asyncio.to_thread(compute_analytics, frames)
+        result["versions"] = current
+        result["computed_at"] = datetime.now()
+        cache.set(key, result)
+    return result
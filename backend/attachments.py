@@ -0,0 +1,138 @@
+import hashlib
+import os
+import re
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+ATTACHMENT_DIR = os.environ.get('ATTACHMENT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads"))
+ATTACHMENT_MAX_BYTES = int(os.environ.get('ATTACHMENT_MAX_BYTES', str(50 * 1024 * 1024)))
+CHUNK_SIZE = 1024 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def blob_path(sha256: str) -> str:
+    # Content-addressed layout: identical uploads map to the same file
+    return os.path.join(ATTACHMENT_DIR, sha256[:2], sha256)
+
+
+def _write_chunk(handle, chunk: bytes) -> None:
+    handle.write(chunk)
+
+
+def _commit_blob(temp_path: str, sha256: str) -> None:
+    final_path = blob_path(sha256)
+    if os.path.exists(final_path):
+        os.remove(temp_path)
+        return
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(temp_path, final_path)
+
+
+async def store_upload(upload: UploadFile) -> Tuple[str, int]:
+    """Stream an upload to disk chunk by chunk, returning its sha256 and size."""
+    temp_dir = os.path.join(ATTACHMENT_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, uuid.uuid4().hex)
+    digest = hashlib.sha256()
+    size = 0
+    handle = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > ATTACHMENT_MAX_BYTES:
+                raise HTTPException(status_code=413, detail="Attachment too large")
+            digest.update(chunk)
+            await run_in_threadpool(_write_chunk, handle, chunk)
+    except BaseException:
+        handle.close()
+        os.remove(temp_path)
+        raise
+    handle.close()
+
+    sha256 = digest.hexdigest()
+    await run_in_threadpool(_commit_blob, temp_path, sha256)
+    return sha256, size
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    # Only single byte ranges are supported; anything else falls back to the full body
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _iter_file(path: str, start: int, end: int):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def attachment_response(request: Request, sha256: str, filename: str, media_type: str) -> Response:
+    path = blob_path(sha256)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    filename = filename.replace('"', "")
+    etag = f'"{sha256}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=0, must-revalidate",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            if int(stat.st_mtime) <= parsedate_to_datetime(request.headers["if-modified-since"]).timestamp():
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() in (etag, last_modified)):
+        byte_range = _parse_range(range_header, stat.st_size)
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            headers["Content-Length"] = str(end - start + 1)
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return StreamingResponse(_iter_file(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+    # Full body: FileResponse streams from disk in chunks without buffering the file
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers, stat_result=stat)
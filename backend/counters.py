@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from seats import sync_seats_taken
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_KEY = "global"
+GLOBAL_FIELDS = ["total_students", "total_internships", "total_reports", "pending_applications"]
+STUDENT_FIELDS = ["applications", "reports", "evaluations"]
+
+# Only the worker holding this lease (in the locks collection, next to the seed lock) reconciles
+RECONCILE_LEASE_ID = "lease:counter-reconciliation"
+_lease_owner = uuid.uuid4().hex
+
+
+def student_key(student_id: str) -> str:
+    return f"student:{student_id}"
+
+
+async def increment(db, key: str, **deltas: int) -> None:
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        await db.counters.update_one({"_id": key}, {"$inc": deltas}, upsert=True)
+
+
+async def increment_many(db, deltas_by_key: dict) -> None:
+    # One bulk_write for counter changes touching many documents
+    operations = [
+        UpdateOne({"_id": key}, {"$inc": deltas}, upsert=True)
+        for key, deltas in deltas_by_key.items()
+        if any(deltas.values())
+    ]
+    if operations:
+        await db.counters.bulk_write(operations, ordered=False)
+
+
+async def read_counters(db, key: str, fields) -> dict:
+    doc = await db.counters.find_one({"_id": key}) or {}
+    return {field: doc.get(field, 0) for field in fields}
+
+
+async def _count_by_student(collection) -> dict:
+    counts = {}
+    async for row in collection.aggregate([{"$group": {"_id": "$student_id", "count": {"$sum": 1}}}]):
+        counts[row["_id"]] = row["count"]
+    return counts
+
+
+async def reconcile_counters(db) -> None:
+    # Recompute every counter from the source collections to correct drift
+    await db.counters.update_one(
+        {"_id": GLOBAL_KEY},
+        {"$set": {
+            "total_students": await db.users.count_documents({"role": "student"}),
+            "total_internships": await db.internships.count_documents({}),
+            "total_reports": await db.reports.count_documents({}),
+            "pending_applications": await db.applications.count_documents({"status": "pending"}),
+        }},
+        upsert=True
+    )
+
+    per_field = {
+        "applications": await _count_by_student(db.applications),
+        "reports": await _count_by_student(db.reports),
+        "evaluations": await _count_by_student(db.evaluations),
+    }
+    stored = {}
+    async for doc in db.counters.find({"_id": {"$regex": "^student:"}}):
+        stored[doc["_id"][len("student:"):]] = {field: doc.get(field, 0) for field in STUDENT_FIELDS}
+
+    # Only counters that drifted are written
+    operations = []
+    for student_id in set(stored).union(*per_field.values()):
+        actual = {field: counts.get(student_id, 0) for field, counts in per_field.items()}
+        if stored.get(student_id) != actual:
+            operations.append(UpdateOne({"_id": student_key(student_id)}, {"$set": actual}, upsert=True))
+    if operations:
+        logger.info("Corrected counters of %d students", len(operations))
+    for start in range(0, len(operations), 1000):
+        await db.counters.bulk_write(operations[start:start + 1000], ordered=False)
+
+    # Seat counts of programs that predate seat tracking
+    seats_fixed = await sync_seats_taken(db.applications, db.internships)
+    if seats_fixed:
+        logger.info("Raised seats_taken on %d internships to their approved applications", seats_fixed)
+
+
+async def _take_lease(db, seconds: float) -> bool:
+    now = datetime.utcnow()
+    try:
+        await db.locks.find_one_and_update(
+            {"_id": RECONCILE_LEASE_ID, "$or": [{"expires_at": {"$lte": now}}, {"owner": _lease_owner}]},
+            {"$set": {"owner": _lease_owner, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lease, so the upsert collided with its document
+        return False
+    return True
+
+
+async def reconcile_if_leased(db, interval: float) -> bool:
+    """Reconcile unless another worker took the lease within the last `interval` seconds."""
+    if not await _take_lease(db, interval):
+        return False
+    await reconcile_counters(db)
+    return True
+
+
+async def run_reconciliation(db, interval: float) -> None:
+    # Startup has just reconciled, so each run comes at the end of its interval
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_if_leased(db, interval)
+        except Exception:
+            logger.exception("Counter reconciliation failed")
@@ -0,0 +1,95 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, Set
+
+HEARTBEAT_INTERVAL = 15.0
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class LocalBroker:
+    """In-process pub/sub keyed by topic (a user id or "role:<role>").
+
+    Publishing costs one queue put per subscriber of the topic, so idle
+    connections cost nothing but their queue. This is the single-worker
+    stand-in; a shared backend (e.g. Redis pub/sub or a capped collection
+    tailed by every worker) only needs to provide the same publish/subscribe.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.published = 0
+        self.dropped = 0
+
+    async def publish(self, topic: str, event: str, data: dict) -> None:
+        self.published += 1
+        message = (event, data)
+        for queue in list(self._subscribers.get(topic, ())):
+            if queue.full():
+                # A slow client loses its oldest event rather than stalling the publisher
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    def close(self) -> None:
+        # Wake every stream with the end-of-stream marker
+        for queue in {queue for queues in self._subscribers.values() for queue in queues}:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def subscribe(self, topics: Iterable[str]) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        for topic in topics:
+            self._subscribers[topic].add(queue)
+        return queue
+
+    def unsubscribe(self, topics: Iterable[str], queue: asyncio.Queue) -> None:
+        for topic in topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def stats(self) -> dict:
+        return {
+            "topics": len(self._subscribers),
+            "connections": len({id(queue) for queues in self._subscribers.values() for queue in queues}),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+
+async def event_stream(broker: LocalBroker, topics: Iterable[str], request) -> AsyncIterator[str]:
+    topics = list(topics)
+    queue = broker.subscribe(topics)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment line keeps proxies from closing an idle connection
+                yield ": ping\n\n"
+                continue
+            if message is None:
+                break
+            event, data = message
+            yield format_event(event, data)
+    finally:
+        broker.unsubscribe(topics, queue)
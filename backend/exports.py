@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, List
+
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_COLUMNS = {
+    "applications": ["id", "student_id", "student_name", "internship_id", "internship_title", "status", "applied_at", "documents"],
+    "reports": ["id", "student_id", "student_name", "internship_id", "internship_title", "title", "status", "submitted_at", "file_name", "file_size", "content"],
+    "evaluations": ["id", "student_id", "student_name", "internship_id", "internship_title", "grade", "feedback", "evaluated_by", "evaluated_at"],
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+def _encode(batch: List[dict], columns: List[str], fmt: str) -> str:
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps({column: doc.get(column) for column in columns}, default=_json_default) + "\n"
+            for doc in batch
+        )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for doc in batch:
+        writer.writerow([_csv_value(doc.get(column)) for column in columns])
+    return buffer.getvalue()
+
+
+async def stream_export(
+    cursor,
+    columns: List[str],
+    fmt: str,
+    resolve: Callable[[List[dict]], Awaitable[List[dict]]],
+) -> AsyncIterator[str]:
+    """Yield encoded rows batch by batch, resolving names once per batch."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue()
+
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield _encode(await resolve(batch), columns, fmt)
+            batch = []
+    if batch:
+        yield _encode(await resolve(batch), columns, fmt)
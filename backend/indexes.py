@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import logging
+import os
+
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("role", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], name="role_page"),
+    ],
+    "internships": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="page"),
+        IndexModel(
+            [("title", TEXT), ("company_name", TEXT), ("description", TEXT), ("requirements", TEXT)],
+            name="search",
+            weights={"title": 10, "company_name": 5, "requirements": 2, "description": 1},
+        ),
+    ],
+    "applications": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_id", ASCENDING), ("internship_id", ASCENDING)], name="student_internship_unique", unique=True),
+        IndexModel([("internship_id", ASCENDING)], name="internship_id"),
+        IndexModel([("status", ASCENDING)], name="status"),
+        IndexModel([("applied_at", ASCENDING), ("id", ASCENDING)], name="page"),
+        IndexModel([("student_id", ASCENDING), ("applied_at", ASCENDING), ("id", ASCENDING)], name="student_page"),
+    ],
+    "reports": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_id", ASCENDING)], name="student_id"),
+        IndexModel([("internship_id", ASCENDING)], name="internship_id"),
+        IndexModel([("status", ASCENDING)], name="status"),
+        IndexModel([("submitted_at", ASCENDING), ("id", ASCENDING)], name="page"),
+        IndexModel([("student_id", ASCENDING), ("submitted_at", ASCENDING), ("id", ASCENDING)], name="student_page"),
+        IndexModel([("title", TEXT), ("content", TEXT)], name="search", weights={"title": 5, "content": 1}),
+    ],
+    # Evaluations carry no status field, so only the reference keys are indexed
+    "evaluations": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_id", ASCENDING)], name="student_id"),
+        IndexModel([("internship_id", ASCENDING)], name="internship_id"),
+        IndexModel([("evaluated_at", ASCENDING), ("id", ASCENDING)], name="page"),
+        IndexModel([("student_id", ASCENDING), ("evaluated_at", ASCENDING), ("id", ASCENDING)], name="student_page"),
+    ],
+    # Shared login/registration token buckets; an hour idle is long past a full refill
+    "rate_limits": [
+        IndexModel([("updated_at", ASCENDING)], name="idle_ttl", expireAfterSeconds=3600),
+    ],
+}
+
+# Representative hot-path filters whose plans are checked by `check_indexes`
+PROBE_QUERIES = {
+    "users": [{"id": "probe"}, {"username": "probe"}, {"role": "student"}],
+    "internships": [{"id": "probe"}],
+    "applications": [
+        {"student_id": "probe", "internship_id": "probe"},
+        {"student_id": "probe"},
+        {"internship_id": "probe"},
+        {"status": "pending"},
+    ],
+    "reports": [{"student_id": "probe"}, {"internship_id": "probe"}],
+    "evaluations": [{"student_id": "probe"}, {"internship_id": "probe"}],
+}
+
+SLOW_PLAN_RATIO = 10
+
+
+async def ensure_indexes(db) -> list:
+    """Create every index, one at a time, and return the ones that could not be built.
+
+    create_indexes is a no-op for indexes that already exist with the same spec. Each index
+    is built on its own so one blocked index (e.g. a unique index over legacy duplicates)
+    does not take the rest of its collection's indexes down with it.
+    """
+    failures = []
+    for collection_name, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection_name].create_indexes([model])
+            except OperationFailure as e:
+                logger.error(
+                    "Could not create index %s.%s: %s -- fix the data and run `python indexes.py ensure`",
+                    collection_name, name, e
+                )
+                failures.append({"collection": collection_name, "name": name, "error": str(e)})
+    return failures
+
+
+def _plan_stages(plan: dict):
+    yield plan.get("stage")
+    if "inputStage" in plan:
+        yield from _plan_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def check_indexes(db) -> dict:
+    missing = []
+    for collection_name, models in INDEXES.items():
+        existing = {}
+        async for index in db[collection_name].list_indexes():
+            existing[index["name"]] = list(index["key"].items())
+        for model in models:
+            spec = model.document
+            # Text indexes are listed under their internal _fts key, so match by name as well
+            if spec["name"] not in existing and list(spec["key"].items()) not in existing.values():
+                missing.append({"collection": collection_name, "name": spec["name"], "key": list(spec["key"].items())})
+
+    slow_plans = []
+    for collection_name, filters in PROBE_QUERIES.items():
+        for query_filter in filters:
+            explain = await db.command(
+                {"explain": {"find": collection_name, "filter": query_filter}, "verbosity": "executionStats"}
+            )
+            stages = [stage for stage in _plan_stages(explain["queryPlanner"]["winningPlan"]) if stage]
+            stats = explain.get("executionStats", {})
+            docs_examined = stats.get("totalDocsExamined", 0)
+            returned = stats.get("nReturned", 0)
+            if "COLLSCAN" in stages or docs_examined > SLOW_PLAN_RATIO * max(returned, 1):
+                slow_plans.append({
+                    "collection": collection_name,
+                    "filter": query_filter,
+                    "stages": stages,
+                    "docs_examined": docs_examined,
+                    "returned": returned,
+                })
+
+    return {"missing_indexes": missing, "slow_plans": slow_plans}
+
+
+async def _main(command: str) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017/'))
+    db = client[os.environ.get('MONGO_DB_NAME', 'internship_monitoring')]
+    try:
+        failures = await ensure_indexes(db) if command == "ensure" else []
+        report = await check_indexes(db)
+    finally:
+        client.close()
+
+    for item in failures:
+        print(f"FAILED   {item['collection']}.{item['name']}: {item['error']}")
+    for item in report["missing_indexes"]:
+        print(f"MISSING  {item['collection']}.{item['name']} {item['key']}")
+    for item in report["slow_plans"]:
+        print(f"SLOW     {item['collection']} {item['filter']} stages={item['stages']} "
+              f"examined={item['docs_examined']} returned={item['returned']}")
+    if not report["missing_indexes"] and not report["slow_plans"]:
+        print("All indexes present and probe queries are index-backed")
+    return 1 if failures or report["missing_indexes"] or report["slow_plans"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or verify MongoDB indexes")
+    parser.add_argument("command", choices=["check", "ensure"])
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args.command)))
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Returned by servers without a replica set / oplog
+CHANGE_STREAM_UNSUPPORTED = {40573, 40324, 136}
+
+
+class InternshipCache:
+    """Per-worker copy of the internship catalogue, keyed by internship id.
+
+    Writes made by this worker are applied directly. Writes made by other workers
+    arrive through a change stream or, when the server has no replica set, by
+    polling the catalogue version and reloading when it moves.
+    """
+
+    def __init__(self, collection, versions, poll_interval: float = 2.0):
+        self.collection = collection
+        self.versions = versions
+        self.poll_interval = poll_interval
+        self.loaded = False
+        self.mode = "cold"
+        self._docs: Dict[str, dict] = {}
+        self._ids_by_oid: Dict[object, str] = {}
+        self._sorted: Optional[List[dict]] = None
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.events = 0
+        self.last_sync = 0.0
+        self.last_event_lag = 0.0
+
+    def _put(self, doc: dict) -> None:
+        oid = doc.pop("_id", None)
+        if oid is not None:
+            self._ids_by_oid[oid] = doc["id"]
+        self._docs[doc["id"]] = doc
+        self._sorted = None
+
+    def _remove_oid(self, oid) -> None:
+        internship_id = self._ids_by_oid.pop(oid, None)
+        if internship_id is not None:
+            self._docs.pop(internship_id, None)
+            self._sorted = None
+
+    async def load(self) -> None:
+        version = await self.versions.get("internships")
+        docs = await self.collection.find({}).to_list(length=None)
+        self._docs = {}
+        self._ids_by_oid = {}
+        for doc in docs:
+            self._put(doc)
+        self._version = version
+        self.loaded = True
+        self.reloads += 1
+        self.last_sync = time.monotonic()
+
+    async def refresh(self, internship_id: str) -> None:
+        # Write-through for changes made by this worker
+        doc = await self.collection.find_one({"id": internship_id})
+        if doc:
+            self._put(doc)
+        else:
+            self.discard(internship_id)
+
+    def discard(self, internship_id: str) -> None:
+        if self._docs.pop(internship_id, None) is not None:
+            self._ids_by_oid = {oid: iid for oid, iid in self._ids_by_oid.items() if iid != internship_id}
+            self._sorted = None
+
+    def all(self) -> List[dict]:
+        """All internships ordered by (created_at, id)."""
+        self.hits += 1
+        if self._sorted is None:
+            self._sorted = sorted(self._docs.values(), key=lambda doc: (doc["created_at"], doc["id"]))
+        return self._sorted
+
+    async def get_many(self, ids: Iterable[str]) -> Dict[str, dict]:
+        found = {}
+        missing = []
+        for internship_id in ids:
+            doc = self._docs.get(internship_id)
+            if doc is None:
+                missing.append(internship_id)
+            else:
+                found[internship_id] = doc
+        self.hits += len(found)
+        if missing:
+            self.misses += len(missing)
+            async for doc in self.collection.find({"id": {"$in": missing}}):
+                self._put(doc)
+                found[doc["id"]] = doc
+        return found
+
+    async def titles(self, ids: Iterable[str]) -> Dict[str, str]:
+        return {internship_id: doc["title"] for internship_id, doc in (await self.get_many(ids)).items()}
+
+    async def _watch(self) -> None:
+        async with self.collection.watch(full_document="updateLookup") as stream:
+            self.mode = "change_stream"
+            # Anything written before the stream opened is picked up by a fresh load
+            await self.load()
+            async for change in stream:
+                operation = change["operationType"]
+                if operation in ("insert", "replace", "update"):
+                    if change.get("fullDocument"):
+                        self._put(change["fullDocument"])
+                    else:
+                        self._remove_oid(change["documentKey"]["_id"])
+                elif operation == "delete":
+                    self._remove_oid(change["documentKey"]["_id"])
+                elif operation in ("drop", "rename", "dropDatabase", "invalidate"):
+                    await self.load()
+                self.events += 1
+                self.last_sync = time.monotonic()
+                if "clusterTime" in change:
+                    self.last_event_lag = max(time.time() - change["clusterTime"].time, 0.0)
+
+    async def _poll(self) -> None:
+        self.mode = "polling"
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await self.versions.get("internships") != self._version:
+                    await self.load()
+                else:
+                    self.last_sync = time.monotonic()
+            except PyMongoError:
+                logger.exception("Internship cache poll failed")
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._watch()
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED:
+                    logger.info("Change streams unavailable (%s); polling the internship catalogue", e)
+                    await self._poll()
+                    return
+                logger.exception("Internship change stream failed; reopening")
+            except PyMongoError:
+                logger.exception("Internship change stream failed; reopening")
+            self.loaded = False
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "size": len(self._docs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "reloads": self.reloads,
+            "events": self.events,
+            "seconds_since_sync": time.monotonic() - self.last_sync if self.last_sync else None,
+            "last_event_lag": self.last_event_lag,
+        }
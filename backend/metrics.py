@@ -0,0 +1,207 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RequestStats:
+    """Database work attributed to one HTTP request."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.by_command: Dict[Tuple[str, str], list] = defaultdict(lambda: [0, 0.0])
+
+    def add(self, command: str, collection: str, seconds: float) -> None:
+        with self.lock:
+            self.queries += 1
+            self.db_seconds += seconds
+            entry = self.by_command[(command, collection)]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def breakdown(self) -> str:
+        return ", ".join(
+            f"{command} {collection} x{count} {seconds * 1000:.1f}ms"
+            for (command, collection), (count, seconds) in sorted(self.by_command.items(), key=lambda item: -item[1][1])
+        )
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("current_request", default=None)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.in_flight = 0
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.queries_per_request: Dict[Tuple[str, str], Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.statuses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.commands: Dict[str, list] = defaultdict(lambda: [0, 0.0, 0])
+        self._commands_lock = threading.Lock()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        if key not in self.latency:
+            self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.queries_per_request[key] = Histogram(QUERY_COUNT_BUCKETS)
+        self.latency[key].observe(seconds)
+        self.queries_per_request[key].observe(stats.queries)
+        self.db_seconds[key] += stats.db_seconds
+        self.statuses[(method, route, status)] += 1
+
+    def observe_command(self, command: str, seconds: float, failed: bool) -> None:
+        with self._commands_lock:
+            entry = self.commands[command]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += int(failed)
+
+    def render(self) -> str:
+        lines = [
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines += histogram.render("http_request_duration_seconds", f'method="{method}",route="{route}"')
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in sorted(self.statuses.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        lines.append("# TYPE http_request_db_queries histogram")
+        for (method, route), histogram in sorted(self.queries_per_request.items()):
+            lines += histogram.render("http_request_db_queries", f'method="{method}",route="{route}"')
+        lines.append("# TYPE http_request_db_seconds_total counter")
+        for (method, route), seconds in sorted(self.db_seconds.items()):
+            lines.append(f'http_request_db_seconds_total{{method="{method}",route="{route}"}} {seconds}')
+        lines.append("# TYPE mongodb_commands_total counter")
+        lines.append("# TYPE mongodb_command_seconds_total counter")
+        lines.append("# TYPE mongodb_command_failures_total counter")
+        with self._commands_lock:
+            commands = sorted((name, list(entry)) for name, entry in self.commands.items())
+        for name, (count, seconds, failures) in commands:
+            lines.append(f'mongodb_commands_total{{command="{name}"}} {count}')
+            lines.append(f'mongodb_command_seconds_total{{command="{name}"}} {seconds}')
+            lines.append(f'mongodb_command_failures_total{{command="{name}"}} {failures}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class QueryAccountingListener(monitoring.CommandListener):
+    """Attributes every MongoDB command to the HTTP request that issued it.
+
+    Motor runs pymongo on executor threads with the caller's context copied,
+    so the request's RequestStats is visible through `current_request` here.
+    """
+
+    def __init__(self):
+        self._started: Dict[Tuple, Tuple[Optional[RequestStats], str]] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        collection = collection if isinstance(collection, str) else ""
+        self._started[(event.connection_id, event.request_id)] = (current_request.get(), collection)
+
+    def _finish(self, event, failed: bool):
+        stats, collection = self._started.pop((event.connection_id, event.request_id), (None, ""))
+        seconds = event.duration_micros / 1_000_000
+        registry.observe_command(event.command_name, seconds, failed)
+        if stats is not None:
+            stats.add(event.command_name, collection, seconds)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+class MetricsMiddleware:
+    """Per-route latency, status and query accounting as a pure ASGI middleware.
+
+    Timing ends with the final response body message, so streamed exports are measured
+    to their last chunk and the queries they issue while streaming count for their route.
+    """
+
+    def __init__(self, app, slow_request_seconds: float = 0.0):
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        registry.in_flight += 1
+        started = time.perf_counter()
+        status = 500
+        elapsed = None
+
+        async def send_and_time(message):
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this, but the client already has its response
+                elapsed = time.perf_counter() - started
+
+        try:
+            await self.app(scope, receive, send_and_time)
+        finally:
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+            registry.in_flight -= 1
+            current_request.reset(token)
+            self._observe(scope, status, elapsed, stats)
+
+    def _observe(self, scope, status: int, elapsed: float, stats: RequestStats) -> None:
+        method = scope["method"]
+        # The router records the matched route in the shared scope
+        route_path = getattr(scope.get("route"), "path", "unmatched")
+        registry.observe_request(method, route_path, status, elapsed, stats)
+        if self.slow_request_seconds and elapsed >= self.slow_request_seconds:
+            logger.warning(
+                "Slow request %s %s %.0fms status=%s queries=%d db=%.0fms [%s]",
+                method, route_path, elapsed * 1000, status,
+                stats.queries, stats.db_seconds * 1000, stats.breakdown()
+            )
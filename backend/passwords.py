@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# Legacy accounts hold bare SHA-256 hex digests; they verify through hex_sha256
+# and are flagged for a rehash to argon2 on the next successful login.
+pwd_context = CryptContext(schemes=["argon2", "hex_sha256"], deprecated="auto")
+
+# argon2-cffi releases the GIL while hashing, so a thread pool scales across cores
+HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 2)))
+HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', str(HASH_WORKERS * 8)))
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_slots = asyncio.Semaphore(HASH_MAX_PENDING)
+
+
+class HashingStats:
+    def __init__(self):
+        self.completed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": HASH_WORKERS,
+            "max_pending": HASH_MAX_PENDING,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_time_avg": self.queue_time_total / self.completed if self.completed else 0.0,
+            "queue_time_max": self.queue_time_max,
+            "run_time_avg": self.run_time_total / self.completed if self.completed else 0.0,
+        }
+
+
+stats = HashingStats()
+
+
+async def _run(fn, *args):
+    enqueued = time.perf_counter()
+    stats.waiting += 1
+    async with _slots:
+        stats.waiting -= 1
+        stats.in_flight += 1
+        started = []
+
+        def timed():
+            started.append(time.perf_counter())
+            return fn(*args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_executor, timed)
+        finally:
+            finished = time.perf_counter()
+            stats.in_flight -= 1
+            if started:
+                queued = started[0] - enqueued
+                stats.completed += 1
+                stats.queue_time_total += queued
+                stats.queue_time_max = max(stats.queue_time_max, queued)
+                stats.run_time_total += finished - started[0]
+
+
+async def hash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    # Returns (valid, new_hash); new_hash is set when the stored hash should be upgraded
+    try:
+        return await _run(pwd_context.verify_and_update, password, hashed)
+    except ValueError:
+        # Not a hash any configured scheme recognises (e.g. a stray plaintext value)
+        return False, None
@@ -0,0 +1,165 @@
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+DEFAULT_MAX_BUCKETS = 100_000
+
+
+def parse_limit(spec: str):
+    """Parse "<requests>/<seconds>" into (rate per second, burst); "0" disables the limit."""
+    requests, _, seconds = spec.partition("/")
+    burst = int(requests)
+    return (burst / float(seconds or 1), burst) if burst > 0 else (0.0, 0)
+
+
+def parse_networks(spec: str) -> list:
+    """Parse a comma-separated list of addresses or CIDR ranges, e.g. "10.0.0.0/8,127.0.0.1"."""
+    return [ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip()]
+
+
+def _trusted(address: str, networks: list) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(peer: str, forwarded_for: List[str], trusted: list) -> str:
+    """The address the request came from, looking through trusted proxies.
+
+    Walks X-Forwarded-For from the right while the hop that appended it is trusted, so a
+    client cannot pick its own bucket by sending the header itself. With no trusted
+    proxies the peer address is used as is.
+    """
+    if not trusted or not _trusted(peer, trusted):
+        return peer
+    hops = [hop.strip() for value in forwarded_for for hop in value.split(",") if hop.strip()]
+    address = peer
+    for hop in reversed(hops):
+        address = hop
+        if not _trusted(hop, trusted):
+            break
+    return address
+
+
+class LocalBuckets:
+    """Per-worker token buckets in an LRU-ordered dict.
+
+    Each check touches one entry and inspects at most a couple of the least recently
+    used ones, evicting buckets that have refilled completely (forgetting those changes
+    nothing). Beyond `max_buckets` the least recently used bucket is dropped regardless.
+    """
+
+    name = "local"
+
+    def __init__(self, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        # key -> [tokens, last update, time at which the bucket is full again]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self.evicted = 0
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(burst)
+        else:
+            tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            self._buckets.move_to_end(key)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = [tokens, now, now + (burst - tokens) / rate]
+        self._evict(now)
+        return retry_after
+
+    def _evict(self, now: float) -> None:
+        for _ in range(2):
+            if not self._buckets:
+                return
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[2] > now and len(self._buckets) <= self.max_buckets:
+                return
+            del self._buckets[key]
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        return {"buckets": len(self._buckets), "evicted": self.evicted}
+
+
+class MongoBuckets:
+    """Token buckets shared by all workers, one document per key.
+
+    The refill and the take happen in a single pipeline update on the server's clock,
+    so concurrent workers cannot both spend the last token. Idle buckets are removed by
+    the TTL index on `updated_at` (see indexes.py).
+    """
+
+    name = "mongo"
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        elapsed = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]}
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [burst, {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, rate]}]}]},
+                    "updated_at": "$$NOW",
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+            ],
+            projection={"_id": 0, "tokens": 1, "allowed": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return 0.0 if doc["allowed"] else (1 - doc["tokens"]) / rate
+
+    def stats(self) -> dict:
+        return {}
+
+
+class RateLimiter:
+    """Token-bucket limits by name (e.g. "login-ip"), each with its own rate and burst."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.limits = {}
+        self.allowed = 0
+        self.rejected = 0
+
+    def add_limit(self, name: str, rate: float, burst: int) -> None:
+        # A zero rate disables the limit
+        if rate > 0 and burst > 0:
+            self.limits[name] = (rate, burst)
+
+    async def check(self, name: str, value: str) -> Optional[int]:
+        """Take a token for `value` under limit `name`; return seconds to wait if none is left."""
+        limit = self.limits.get(name)
+        if limit is None or not value:
+            return None
+        retry_after = await self.backend.take(f"{name}:{value}", *limit)
+        if retry_after:
+            self.rejected += 1
+            return max(math.ceil(retry_after), 1)
+        self.allowed += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "limits": {name: {"rate": rate, "burst": burst} for name, (rate, burst) in self.limits.items()},
+            **self.backend.stats(),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import logging
+import os
+
+from pymongo import UpdateMany
+
+logger = logging.getLogger(__name__)
+
+# Collections that carry denormalized student_name / internship_title display fields
+DENORMALIZED_COLLECTIONS = ("applications", "reports", "evaluations")
+
+# (display field, reference field, source collection, source field)
+DISPLAY_FIELDS = (
+    ("student_name", "student_id", "users", "full_name"),
+    ("internship_title", "internship_id", "internships", "title"),
+)
+
+
+async def propagate_student_name(db, student_id: str, full_name: str) -> None:
+    for name in DENORMALIZED_COLLECTIONS:
+        await db[name].update_many(
+            {"student_id": student_id, "student_name": {"$ne": full_name}},
+            {"$set": {"student_name": full_name}}
+        )
+
+
+async def propagate_internship_title(db, internship_id: str, title: str) -> None:
+    for name in DENORMALIZED_COLLECTIONS:
+        await db[name].update_many(
+            {"internship_id": internship_id, "internship_title": {"$ne": title}},
+            {"$set": {"internship_title": title}}
+        )
+
+
+async def verify_read_model(db, repair: bool = False) -> dict:
+    """Find documents whose display fields disagree with their source; optionally fix them.
+
+    Drift is grouped by (reference, correct value) so each group is repaired by a
+    single update_many, and all repairs for a collection go out in one bulk_write.
+    """
+    report = {}
+    for name in DENORMALIZED_COLLECTIONS:
+        report[name] = {}
+        for display_field, reference_field, source, source_field in DISPLAY_FIELDS:
+            pipeline = [
+                {"$lookup": {
+                    "from": source,
+                    "localField": reference_field,
+                    "foreignField": "id",
+                    "as": "_source",
+                }},
+                {"$project": {
+                    "_id": 0,
+                    "ref": f"${reference_field}",
+                    "stored": f"${display_field}",
+                    "actual": {"$ifNull": [{"$arrayElemAt": [f"$_source.{source_field}", 0]}, "Unknown"]},
+                }},
+                {"$match": {"$expr": {"$ne": ["$stored", "$actual"]}}},
+                {"$group": {"_id": {"ref": "$ref", "actual": "$actual"}, "count": {"$sum": 1}}},
+            ]
+            groups = await db[name].aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+            drifted = sum(group["count"] for group in groups)
+            repaired = 0
+            if repair and groups:
+                operations = [
+                    UpdateMany(
+                        {reference_field: group["_id"]["ref"], display_field: {"$ne": group["_id"]["actual"]}},
+                        {"$set": {display_field: group["_id"]["actual"]}}
+                    )
+                    for group in groups
+                ]
+                result = await db[name].bulk_write(operations, ordered=False)
+                repaired = result.modified_count
+            if drifted:
+                logger.info("%s.%s: %d drifted, %d repaired", name, display_field, drifted, repaired)
+            report[name][display_field] = {"drifted": drifted, "repaired": repaired}
+    return report
+
+
+async def _main(repair: bool) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    if os.environ.get('UUID_STORAGE') == "mixed":
+        print("UUID storage is being migrated (UUID_STORAGE=mixed); verify once the migration has finished")
+        return 2
+
+    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017/'))
+    db = client[os.environ.get('MONGO_DB_NAME', 'internship_monitoring')]
+    try:
+        report = await verify_read_model(db, repair=repair)
+    finally:
+        client.close()
+
+    drifted = 0
+    for name, fields in report.items():
+        for field, counts in fields.items():
+            drifted += counts["drifted"]
+            print(f"{name}.{field}: drifted={counts['drifted']} repaired={counts['repaired']}")
+    return 1 if drifted and not repair else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify (and optionally repair) denormalized display fields")
+    parser.add_argument("--repair", action="store_true")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args.repair)))
@@ -0,0 +1,201 @@
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+# An internship has a free seat while seats_taken < max_students; documents created
+# before seats were tracked have no seats_taken field and count as empty.
+HAS_FREE_SEAT = {"$expr": {"$lt": [{"$ifNull": ["$seats_taken", 0]}, "$max_students"]}}
+
+APPLICATION_STATUSES = ("pending", "approved", "rejected")
+
+
+class SeatsFull(Exception):
+    pass
+
+
+class StatusConflict(Exception):
+    pass
+
+
+async def reserve_seat(internships, internship_id: str) -> bool:
+    # A single conditional $inc: concurrent reservations cannot overshoot max_students
+    result = await internships.update_one(
+        {"id": internship_id, **HAS_FREE_SEAT},
+        {"$inc": {"seats_taken": 1}}
+    )
+    return result.modified_count == 1
+
+
+async def release_seat(internships, internship_id: str) -> None:
+    await internships.update_one(
+        {"id": internship_id, "seats_taken": {"$gt": 0}},
+        {"$inc": {"seats_taken": -1}}
+    )
+
+
+async def change_application_status(applications, internships, application_id: str, status: str) -> Optional[dict]:
+    """Move an application to `status`, holding a seat while it is approved.
+
+    Returns the application as it was before the change, or None if it does not exist.
+    Raises SeatsFull when approving into a full internship, and StatusConflict when
+    another request changed the application concurrently.
+    """
+    previous = await applications.find_one(
+        {"id": application_id},
+        {"_id": 0, "status": 1, "student_id": 1, "internship_id": 1}
+    )
+    if not previous or previous["status"] == status:
+        return previous
+
+    approving = status == "approved"
+    unapproving = previous["status"] == "approved"
+    if approving and not await reserve_seat(internships, previous["internship_id"]):
+        raise SeatsFull()
+
+    # Compare-and-set on the previous status so two reviewers cannot both take a seat
+    result = await applications.update_one(
+        {"id": application_id, "status": previous["status"]},
+        {"$set": {"status": status}}
+    )
+    if result.modified_count == 0:
+        if approving:
+            await release_seat(internships, previous["internship_id"])
+        raise StatusConflict()
+
+    if unapproving:
+        await release_seat(internships, previous["internship_id"])
+    return previous
+
+
+async def sync_seats_taken(applications, internships) -> int:
+    """Raise seats_taken to at least the number of approved applications per internship.
+
+    Internships created before seats were tracked start from 0 however many students are
+    already approved. Only ever raising the value keeps this safe to run alongside live
+    reservations, which take their seat before the application is marked approved.
+    """
+    operations = [
+        UpdateOne({"id": row["_id"]}, {"$max": {"seats_taken": row["approved"]}})
+        async for row in applications.aggregate([
+            {"$match": {"status": "approved"}},
+            {"$group": {"_id": "$internship_id", "approved": {"$sum": 1}}},
+        ])
+    ]
+    modified = 0
+    for start in range(0, len(operations), 1000):
+        result = await internships.bulk_write(operations[start:start + 1000], ordered=False)
+        modified += result.modified_count
+    return modified
+
+
+async def reserve_seats(internships, internship_id: str, wanted: int) -> int:
+    """Atomically take up to `wanted` seats, returning how many were granted."""
+    seats_taken = {"$ifNull": ["$seats_taken", 0]}
+    before = await internships.find_one_and_update(
+        {"id": internship_id},
+        [{"$set": {"seats_taken": {"$max": [seats_taken, {"$min": ["$max_students", {"$add": [seats_taken, wanted]}]}]}}}],
+        projection={"_id": 0, "seats_taken": 1, "max_students": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not before:
+        return 0
+    taken = before.get("seats_taken", 0)
+    return max(min(before["max_students"], taken + wanted) - taken, 0)
+
+
+async def release_seats(internships, internship_id: str, count: int) -> None:
+    await internships.update_one(
+        {"id": internship_id},
+        [{"$set": {"seats_taken": {"$max": [0, {"$subtract": [{"$ifNull": ["$seats_taken", 0]}, count]}]}}}]
+    )
+
+
+async def change_application_statuses(applications, internships, decisions: List[dict]) -> List[dict]:
+    """Apply many status decisions with one read, one seat update per internship and one bulk_write.
+
+    Each decision is {"application_id", "status"}. Returns one result per decision, in order,
+    with "result" one of updated, unchanged, invalid, not_found, duplicate, full or conflict;
+    updated results also carry the previous status, student_id and internship_id.
+    Each write stamps the call's `decision_id`, so a compare-and-set lost to a concurrent
+    request that chose the same status is still reported as a conflict.
+    """
+    results = [{"application_id": d["application_id"], "status": d["status"]} for d in decisions]
+    ids = list({d["application_id"] for d in decisions})
+    previous = {}
+    async for doc in applications.find({"id": {"$in": ids}}, {"_id": 0, "id": 1, "status": 1, "student_id": 1, "internship_id": 1}):
+        previous[doc["id"]] = doc
+
+    seen = set()
+    pending_items = []
+    for result in results:
+        application_id = result["application_id"]
+        if result["status"] not in APPLICATION_STATUSES:
+            result["result"] = "invalid"
+        elif application_id in seen:
+            result["result"] = "duplicate"
+        elif application_id not in previous:
+            result["result"] = "not_found"
+        elif previous[application_id]["status"] == result["status"]:
+            result["result"] = "unchanged"
+        else:
+            pending_items.append(result)
+        seen.add(application_id)
+
+    # Approvals take seats in request order, up to what each internship has left
+    wanted = Counter(
+        previous[r["application_id"]]["internship_id"]
+        for r in pending_items
+        if r["status"] == "approved"
+    )
+    granted = {internship_id: await reserve_seats(internships, internship_id, count) for internship_id, count in wanted.items()}
+    decision_id = uuid.uuid4().hex
+    operations = []
+    to_write = []
+    for result in pending_items:
+        doc = previous[result["application_id"]]
+        if result["status"] == "approved":
+            if granted[doc["internship_id"]] == 0:
+                result["result"] = "full"
+                continue
+            granted[doc["internship_id"]] -= 1
+        operations.append(UpdateOne(
+            {"id": doc["id"], "status": doc["status"]},
+            {"$set": {"status": result["status"], "decision_id": decision_id}}
+        ))
+        to_write.append(result)
+
+    if operations:
+        bulk = await applications.bulk_write(operations, ordered=False)
+        if bulk.modified_count != len(operations):
+            # Some compare-and-sets lost to a concurrent change; only documents carrying this
+            # call's decision_id were written by it, whatever status they hold now
+            written = set()
+            async for doc in applications.find(
+                {"id": {"$in": [r["application_id"] for r in to_write]}, "decision_id": decision_id},
+                {"_id": 0, "id": 1}
+            ):
+                written.add(doc["id"])
+            for result in to_write:
+                if result["application_id"] not in written:
+                    result["result"] = "conflict"
+
+    releases: Dict[str, int] = defaultdict(int)
+    for result in to_write:
+        doc = previous[result["application_id"]]
+        if result.get("result") == "conflict":
+            if result["status"] == "approved":
+                releases[doc["internship_id"]] += 1
+            continue
+        result["result"] = "updated"
+        result["previous_status"] = doc["status"]
+        result["student_id"] = doc["student_id"]
+        result["internship_id"] = doc["internship_id"]
+        if doc["status"] == "approved":
+            releases[doc["internship_id"]] += 1
+
+    for internship_id, count in releases.items():
+        if count:
+            await release_seats(internships, internship_id, count)
+    return results
@@ -1,18 +1,45 @@
-from fastapi import FastAPI, HTTPException, Depends, Form, File, UploadFile
+from fastapi import FastAPI, HTTPException, Depends, Form, File, UploadFile, Query, Request, Response, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse, ORJSONResponse, PlainTextResponse
+from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi.concurrency import run_in_threadpool
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from pydantic import BaseModel, Field, ValidationError
 from typing import Optional, List
 import os
+import hmac
+import ipaddress
 import jwt
-import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import uuid
 import json
+import base64
+import asyncio
+import time
 from bson import ObjectId
 
-app = FastAPI()
+from indexes import ensure_indexes, check_indexes
+from cache import TTLCache
+import passwords
+from student_import import REQUIRED_COLUMNS, iter_batches, ImportFileError
+from attachments import store_upload, attachment_response
+from exports import EXPORT_BATCH_SIZE, EXPORT_COLUMNS, MEDIA_TYPES, stream_export
+from versions import CollectionVersions
+from internship_cache import InternshipCache
+from events import LocalBroker, event_stream
+from seats import APPLICATION_STATUSES, SeatsFull, StatusConflict, change_application_status, change_application_statuses
+from read_model import propagate_student_name, propagate_internship_title, verify_read_model
+from metrics import MetricsMiddleware, QueryAccountingListener, registry
+from analytics import cohort_analytics
+from single_flight import SingleFlight
+from uuid_storage import storage_database
+from rate_limit import LocalBuckets, MongoBuckets, RateLimiter, client_ip, parse_limit, parse_networks
+from counters import GLOBAL_KEY, GLOBAL_FIELDS, STUDENT_FIELDS, student_key, increment, increment_many, read_counters, reconcile_if_leased, run_reconciliation
+
+# orjson encodes datetimes natively and is several times faster than the stdlib encoder
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -21,17 +48,71 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
 )
 
+# Per-route latency, status and query accounting; requests slower than this are logged with their queries
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', '1'))
+app.add_middleware(MetricsMiddleware, slow_request_seconds=SLOW_REQUEST_SECONDS)
+
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
-client = MongoClient(mongo_url)
-db = client.internship_monitoring
+# Pool sizes are per worker process; `python server.py --workers N` divides MONGO_TOTAL_POOL_SIZE between workers
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+    event_listeners=[QueryAccountingListener()],
+    uuidRepresentation="standard"
+)
+# UUID_STORAGE=binary keeps ids and references as 16-byte BSON UUIDs instead of 36-character strings;
+# handlers keep working with strings. Use `mixed` while uuid_storage.py migrates existing data.
+UUID_STORAGE = os.environ.get('UUID_STORAGE', 'string')
+db = storage_database(client[os.environ.get('MONGO_DB_NAME', 'internship_monitoring')], UUID_STORAGE)
 
 # Security
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 SECRET_KEY = "your-secret-key-change-in-production"
 
+# Authenticated principal caches. User entries remember the `users` collection version they were
+# read at: updates and deletes bump it, so every worker reloads within VERSION_REFRESH_INTERVAL.
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '10000'))
+AUTH_CACHE_TTL = float(os.environ.get('AUTH_CACHE_TTL', '60'))
+token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+# Dashboard counters are corrected from the source collections on this interval, by one worker at a time
+COUNTER_RECONCILE_INTERVAL = float(os.environ.get('COUNTER_RECONCILE_INTERVAL', '300'))
+
+# Versions of mostly-read collections, used for ETags on their listings
+versions = CollectionVersions(db, refresh_interval=float(os.environ.get('VERSION_REFRESH_INTERVAL', '1')))
+
+# Push notifications for connected clients
+broker = LocalBroker()
+
+# Concurrent identical reads share one execution; a non-zero window also reuses the finished result briefly
+single_flight = SingleFlight()
+SINGLE_FLIGHT_WINDOW = float(os.environ.get('SINGLE_FLIGHT_WINDOW', '0'))
+
+# Login/registration throttling, checked before any database or hashing work.
+# Limits are "<requests>/<seconds>" per client IP and per username; "0" turns one off.
+# RATE_LIMIT_BACKEND=mongo shares buckets between workers, `off` disables throttling.
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'local')
+rate_limiter = RateLimiter(MongoBuckets(db.rate_limits) if RATE_LIMIT_BACKEND == "mongo" else LocalBuckets())
+if RATE_LIMIT_BACKEND != "off":
+    rate_limiter.add_limit("login-ip", *parse_limit(os.environ.get('LOGIN_IP_LIMIT', '60/60')))
+    rate_limiter.add_limit("login-user", *parse_limit(os.environ.get('LOGIN_USER_LIMIT', '10/300')))
+    rate_limiter.add_limit("register-ip", *parse_limit(os.environ.get('REGISTER_IP_LIMIT', '10/600')))
+    rate_limiter.add_limit("register-user", *parse_limit(os.environ.get('REGISTER_USER_LIMIT', '5/600')))
+# Behind a reverse proxy or ingress every request arrives from the proxy's address, which would put
+# all clients in one per-IP bucket. TRUSTED_PROXIES lists the proxies' addresses or CIDR ranges
+# (comma-separated); requests from them are attributed to the X-Forwarded-For address they report.
+TRUSTED_PROXIES = parse_networks(os.environ.get('TRUSTED_PROXIES', ''))
+
+# Cohort analytics, keyed by the versions of the collections they are computed from
+analytics_cache = TTLCache(maxsize=4, ttl=float(os.environ.get('ANALYTICS_CACHE_TTL', '3600')))
+
 # Collections
 users_collection = db.users
 internships_collection = db.internships
@@ -39,6 +120,11 @@ reports_collection = db.reports
 evaluations_collection = db.evaluations
 applications_collection = db.applications
 
+# Per-worker internship catalogue, kept current by a change stream (or version polling)
+internship_cache = InternshipCache(
+    internships_collection, versions, poll_interval=float(os.environ.get('INTERNSHIP_CACHE_POLL_INTERVAL', '2'))
+)
+
 # Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -62,6 +148,7 @@ class InternshipProgram(BaseModel):
     duration: str
     requirements: str
     max_students: int
+    seats_taken: int = 0  # approved applications holding a seat, maintained by the seats module
     status: str = "active"
     created_by: str
     created_at: datetime = Field(default_factory=datetime.now)
@@ -73,6 +160,10 @@ class Report(BaseModel):
     title: str
     content: str
     file_path: Optional[str] = None
+    file_name: Optional[str] = None
+    file_size: Optional[int] = None
+    file_sha256: Optional[str] = None
+    file_content_type: Optional[str] = None
     submitted_at: datetime = Field(default_factory=datetime.now)
     status: str = "submitted"
 
@@ -93,13 +184,19 @@ class Application(BaseModel):
     applied_at: datetime = Field(default_factory=datetime.now)
     documents: List[str] = []
 
-# Helper functions
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+MAX_BULK_ITEMS = 1000
+
+class StatusDecision(BaseModel):
+    application_id: str
+    status: str
+
+class BulkStatusUpdate(BaseModel):
+    decisions: List[StatusDecision] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
 
-def verify_password(password: str, hashed: str) -> bool:
-    return hash_password(password) == hashed
+class BulkEvaluations(BaseModel):
+    evaluations: List[Evaluation] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
 
+# Helper functions
 def create_jwt_token(user_id: str, role: str) -> str:
     payload = {
         "user_id": user_id,
@@ -118,74 +215,334 @@ def verify_jwt_token(token: str) -> dict:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = verify_jwt_token(token)
-    user = users_collection.find_one({"id": payload["user_id"]})
+    return await resolve_user(credentials.credentials)
+
+# EventSource cannot send headers. Instead of the session token, which would end up in access
+# logs, the query string carries a ticket that is only valid for opening event streams, briefly.
+STREAM_TICKET_AUDIENCE = "events"
+STREAM_TICKET_TTL = int(os.environ.get('STREAM_TICKET_TTL', '60'))
+
+def create_stream_ticket(user_id: str) -> str:
+    payload = {
+        "user_id": user_id,
+        "aud": STREAM_TICKET_AUDIENCE,
+        "exp": datetime.now(timezone.utc) + timedelta(seconds=STREAM_TICKET_TTL)
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+
+async def get_stream_user(
+    ticket: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+):
+    if credentials:
+        return await resolve_user(credentials.credentials)
+    if not ticket:
+        raise HTTPException(status_code=403, detail="Not authenticated")
+    try:
+        # Session tokens carry no audience, so they are rejected here (and tickets by verify_jwt_token)
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=["HS256"], audience=STREAM_TICKET_AUDIENCE)
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    return await load_user(payload["user_id"])
+
+async def load_user(user_id: str) -> dict:
+    version = await versions.get("users")
+    cached = user_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    user = await users_collection.find_one({"id": user_id}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    user_cache.set(user_id, (version, user))
     return user
 
+async def resolve_user(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = verify_jwt_token(token)
+        # Never keep a decoded token past its own expiry
+        token_cache.set(token, payload, ttl=payload["exp"] - time.time())
+    
+    return await load_user(payload["user_id"])
+
+async def resolve_names(docs: List[dict], include_student: bool = True) -> List[dict]:
+    # Documents written since the read model was introduced already carry their display
+    # fields; only older ones need a lookup, done with one $in query per referenced collection
+    student_names = {}
+    if include_student:
+        student_ids = list({doc["student_id"] for doc in docs if "student_name" not in doc})
+        if student_ids:
+            async for student in users_collection.find({"id": {"$in": student_ids}}, {"_id": 0, "id": 1, "full_name": 1}):
+                student_names[student["id"]] = student["full_name"]
+
+    internship_ids = {doc["internship_id"] for doc in docs if "internship_title" not in doc}
+    internship_titles = await internship_cache.titles(internship_ids) if internship_ids else {}
+
+    # Callers exclude _id by projection, so documents can be annotated in place
+    for doc in docs:
+        if include_student and "student_name" not in doc:
+            doc["student_name"] = student_names.get(doc["student_id"], "Unknown")
+        if "internship_title" not in doc:
+            doc["internship_title"] = internship_titles.get(doc["internship_id"], "Unknown")
+    return docs
+
+async def with_display_names(document: dict) -> dict:
+    # Store student_name / internship_title on the document so listings need no joins
+    return (await resolve_names([document]))[0]
+
+def json_list(content: List[dict], response: Response) -> ORJSONResponse:
+    # Returning the response directly skips jsonable_encoder; headers set on `response` are carried over
+    result = ORJSONResponse(content)
+    for name, value in response.headers.items():
+        result.headers[name] = value
+    return result
+
+# Pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(sort_value: datetime, doc_id: str) -> str:
+    raw = json.dumps([sort_value.isoformat(), doc_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(sort_value), doc_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def build_projection(fields: Optional[str], required: List[str], excluded: List[str]) -> dict:
+    # Excluded fields (e.g. password) can never be requested back through `fields`
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        projection = {name: 1 for name in (requested | set(required)) - set(excluded)}
+        projection["_id"] = 0
+        return projection
+    projection = {name: 0 for name in excluded}
+    projection["_id"] = 0
+    return projection
+
+def date_range_filter(query: dict, field: str, since: Optional[datetime], until: Optional[datetime]) -> dict:
+    if since or until:
+        query[field] = {}
+        if since:
+            query[field]["$gte"] = since
+        if until:
+            query[field]["$lt"] = until
+    return query
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored datetimes are naive; an offset in the query string (e.g. "Z") would make comparisons raise
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+async def paginate(collection, query: dict, sort_field: str, projection: dict, limit: int, after: Optional[str], response: Response, descending: bool = False) -> List[dict]:
+    # Keyset pagination on (sort_field, id); the next cursor is returned in the X-Next-Cursor header
+    beyond, direction = ("$lt", -1) if descending else ("$gt", 1)
+    if after:
+        last_value, last_id = decode_cursor(after)
+        query = {"$and": [query, {"$or": [
+            {sort_field: {beyond: last_value}},
+            {sort_field: last_value, "id": {beyond: last_id}},
+        ]}]}
+    docs = await collection.find(query, projection).sort([(sort_field, direction), ("id", direction)]).limit(limit + 1).to_list(length=limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1][sort_field], docs[-1]["id"])
+    return docs
+
+def apply_projection(doc: dict, projection: dict) -> dict:
+    included = [name for name, flag in projection.items() if flag and name != "_id"]
+    if included:
+        return {name: doc[name] for name in included if name in doc}
+    return {name: value for name, value in doc.items() if projection.get(name, 1) and name != "_id"}
+
+def paginate_cached(docs: List[dict], sort_field: str, projection: dict, limit: int, after: Optional[str], response: Response, descending: bool = False) -> List[dict]:
+    # Same keyset contract as `paginate`, over documents already sorted by (sort_field, id)
+    if descending:
+        docs = docs[::-1]
+    if after:
+        last_key = decode_cursor(after)
+        if descending:
+            docs = [doc for doc in docs if (doc[sort_field], doc["id"]) < last_key]
+        else:
+            docs = [doc for doc in docs if (doc[sort_field], doc["id"]) > last_key]
+    page = docs[:limit + 1]
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1][sort_field], page[-1]["id"])
+    return [apply_projection(doc, projection) for doc in page]
+
+async def internship_changed(internship_id: str) -> None:
+    # Invalidate catalogue ETags and refresh this worker's cached copy
+    await versions.bump("internships")
+    await internship_cache.refresh(internship_id)
+
 # Initialize default users
-def init_default_users():
-    if users_collection.count_documents({}) == 0:
+SEED_LOCK_ID = "seed:default-users"
+
+async def seed_user(user: User) -> str:
+    # $setOnInsert + the unique username index make this safe to run from several workers at once
+    try:
+        await users_collection.update_one({"username": user.username}, {"$setOnInsert": user.dict()}, upsert=True)
+    except DuplicateKeyError:
+        pass
+    return (await users_collection.find_one({"username": user.username}, {"id": 1}))["id"]
+
+async def seed_internship(internship: InternshipProgram) -> None:
+    await internships_collection.update_one(
+        {"title": internship.title, "company_name": internship.company_name},
+        {"$setOnInsert": internship.dict()},
+        upsert=True
+    )
+
+async def init_default_users():
+    # Only the worker that claims the lock seeds: into an empty database, or to finish a seed that failed
+    try:
+        await db.locks.insert_one({"_id": SEED_LOCK_ID, "status": "running", "claimed_at": datetime.utcnow()})
+    except DuplicateKeyError:
+        resumed = await db.locks.find_one_and_update(
+            {"_id": SEED_LOCK_ID, "status": "incomplete"},
+            {"$set": {"status": "running", "claimed_at": datetime.utcnow()}}
+        )
+        if not resumed:
+            return
+    else:
+        if await users_collection.count_documents({}, limit=1):
+            # A database populated before seeding existed
+            await db.locks.update_one({"_id": SEED_LOCK_ID}, {"$set": {"status": "complete"}})
+            return
+    
+    try:
         # Create default Kaprodi
-        kaprodi = User(
+        kaprodi_id = await seed_user(User(
             username="kaprodi",
             email="kaprodi@telkomuniversity.ac.id",
-            password=hash_password("kaprodi123"),
+            password=await passwords.hash_password("kaprodi123"),
             role="kaprodi",
             full_name="Dr. Kaprodi Sistem Informasi"
-        )
-        users_collection.insert_one(kaprodi.dict())
+        ))
         
         # Create default Student
-        student = User(
+        await seed_user(User(
             username="student1",
             email="student1@student.telkomuniversity.ac.id",
-            password=hash_password("student123"),
+            password=await passwords.hash_password("student123"),
             role="student",
             full_name="Ahmad Mahasiswa",
             student_id="1301194001"
-        )
-        users_collection.insert_one(student.dict())
+        ))
         
         # Create sample internship programs
-        internship1 = InternshipProgram(
+        await seed_internship(InternshipProgram(
             title="Software Development Internship",
             company_name="PT. Telkom Indonesia",
             description="Develop and maintain software applications",
             duration="6 months",
             requirements="Programming skills in Python/Java",
             max_students=5,
-            created_by=kaprodi.id
-        )
-        internships_collection.insert_one(internship1.dict())
+            created_by=kaprodi_id
+        ))
         
-        internship2 = InternshipProgram(
+        await seed_internship(InternshipProgram(
             title="Data Analyst Internship",
             company_name="PT. Gojek",
             description="Analyze data and create insights",
             duration="4 months",
             requirements="SQL, Python, Data visualization skills",
             max_students=3,
-            created_by=kaprodi.id
-        )
-        internships_collection.insert_one(internship2.dict())
+            created_by=kaprodi_id
+        ))
+        await versions.bump("internships")
+    except BaseException:
+        # Let the next start finish the job; the upserts above make a partial seed safe to repeat
+        await db.locks.update_one({"_id": SEED_LOCK_ID}, {"$set": {"status": "incomplete"}})
+        raise
+    await db.locks.update_one({"_id": SEED_LOCK_ID}, {"$set": {"status": "complete"}})
 
 # Routes
 @app.on_event("startup")
 async def startup_event():
-    init_default_users()
+    app.state.index_failures = await ensure_indexes(db)
+    await init_default_users()
+    # With several workers only the first to start reconciles; the others wait for their interval
+    await reconcile_if_leased(db, COUNTER_RECONCILE_INTERVAL)
+    await internship_cache.load()
+    app.state.internship_cache_task = asyncio.create_task(internship_cache.run(), name="internship-cache")
+    app.state.reconcile_task = asyncio.create_task(
+        run_reconciliation(db, COUNTER_RECONCILE_INTERVAL), name="counter-reconciliation"
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # End any event streams still open once the graceful shutdown window has passed
+    broker.close()
+    tasks = [app.state.reconcile_task, app.state.internship_cache_task]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    client.close()
+
+# /metrics is meant for the scraper, not the public listener. With METRICS_TOKEN set it requires
+# "Authorization: Bearer <METRICS_TOKEN>"; without it only loopback clients are answered
+# (through TRUSTED_PROXIES, so requests forwarded by the ingress do not count as local).
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+def is_loopback(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    if METRICS_TOKEN:
+        allowed = credentials is not None and hmac.compare_digest(credentials.credentials, METRICS_TOKEN)
+    else:
+        allowed = is_loopback(request_client_ip(request))
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return PlainTextResponse(registry.render() + single_flight.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/api/health")
 async def health_check():
+    # Missing indexes leave uniqueness unenforced, so report them rather than look healthy
+    failures = getattr(app.state, "index_failures", [])
+    if failures:
+        return {"status": "degraded", "index_failures": failures, "timestamp": datetime.now()}
     return {"status": "healthy", "timestamp": datetime.now()}
 
+def request_client_ip(http_request: Request) -> str:
+    peer = http_request.client.host if http_request.client else ""
+    return client_ip(peer, http_request.headers.getlist("x-forwarded-for"), TRUSTED_PROXIES)
+
+async def enforce_rate_limits(action: str, http_request: Request, username: str) -> None:
+    for name, value in ((f"{action}-ip", request_client_ip(http_request)), (f"{action}-user", username.lower())):
+        retry_after = await rate_limiter.check(name, value)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(retry_after)}
+            )
+
 @app.post("/api/login")
-async def login(request: LoginRequest):
-    user = users_collection.find_one({"username": request.username})
-    if not user or not verify_password(request.password, user["password"]):
+async def login(request: LoginRequest, http_request: Request):
+    await enforce_rate_limits("login", http_request, request.username)
+    
+    user = await users_collection.find_one({"username": request.username})
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await passwords.verify_password(request.password, user["password"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Transparently upgrade legacy SHA-256 hashes
+        await users_collection.update_one({"id": user["id"]}, {"$set": {"password": new_hash}})
+        user_cache.invalidate(user["id"])
     
     token = create_jwt_token(user["id"], user["role"])
     return {
@@ -201,13 +558,19 @@ async def login(request: LoginRequest):
     }
 
 @app.post("/api/register")
-async def register(user: User):
-    existing_user = users_collection.find_one({"username": user.username})
+async def register(user: User, http_request: Request):
+    await enforce_rate_limits("register", http_request, user.username)
+    
+    existing_user = await users_collection.find_one({"username": user.username})
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    user.password = hash_password(user.password)
-    users_collection.insert_one(user.dict())
+    user.password = await passwords.hash_password(user.password)
+    try:
+        await users_collection.insert_one(user.dict())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Username already exists")
+    await increment(db, GLOBAL_KEY, total_students=int(user.role == "student"))
     return {"message": "User created successfully"}
 
 @app.get("/api/me")
@@ -222,44 +585,45 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     }
 
 # Dashboard endpoints
+def dashboard_stats_key(current_user: dict):
+    # Kaprodi all see the same global counters; students only their own
+    return ("kaprodi",) if current_user["role"] == "kaprodi" else ("student", current_user["id"])
+
 @app.get("/api/dashboard/stats")
+@single_flight.coalesce(dashboard_stats_key, window=SINGLE_FLIGHT_WINDOW)
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+    # Counters are maintained incrementally by the write endpoints, so this is a single document read
     if current_user["role"] == "kaprodi":
-        total_students = users_collection.count_documents({"role": "student"})
-        total_internships = internships_collection.count_documents({})
-        total_reports = reports_collection.count_documents({})
-        pending_applications = applications_collection.count_documents({"status": "pending"})
-        
-        return {
-            "total_students": total_students,
-            "total_internships": total_internships,
-            "total_reports": total_reports,
-            "pending_applications": pending_applications
-        }
+        return await read_counters(db, GLOBAL_KEY, GLOBAL_FIELDS)
     else:
         # Student stats
-        student_applications = applications_collection.count_documents({"student_id": current_user["id"]})
-        student_reports = reports_collection.count_documents({"student_id": current_user["id"]})
-        evaluations = evaluations_collection.count_documents({"student_id": current_user["id"]})
-        
-        return {
-            "applications": student_applications,
-            "reports": student_reports,
-            "evaluations": evaluations
-        }
+        return await read_counters(db, student_key(current_user["id"]), STUDENT_FIELDS)
+
+@app.get("/api/analytics")
+async def get_analytics(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return await cohort_analytics(db, versions, analytics_cache)
 
 # Students management (Kaprodi only)
 @app.get("/api/students")
-async def get_students(current_user: dict = Depends(get_current_user)):
+async def get_students(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
     if current_user["role"] != "kaprodi":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    students = list(users_collection.find({"role": "student"}))
-    # Convert MongoDB ObjectId to string for JSON serialization
-    for student in students:
-        if "_id" in student:
-            del student["_id"]
-    return students
+    query = date_range_filter({"role": "student"}, "created_at", since, until)
+    projection = build_projection(fields, ["id", "created_at"], ["password"])
+    return json_list(await paginate(users_collection, query, "created_at", projection, limit, after, response, order == "desc"), response)
 
 @app.post("/api/students")
 async def create_student(student: User, current_user: dict = Depends(get_current_user)):
@@ -267,19 +631,99 @@ async def create_student(student: User, current_user: dict = Depends(get_current
         raise HTTPException(status_code=403, detail="Access denied")
     
     student.role = "student"
-    student.password = hash_password(student.password)
-    users_collection.insert_one(student.dict())
+    student.password = await passwords.hash_password(student.password)
+    try:
+        await users_collection.insert_one(student.dict())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Username already exists")
+    await increment(db, GLOBAL_KEY, total_students=1)
     return {"message": "Student created successfully"}
 
+IMPORT_BATCH_SIZE = 500
+
+@app.post("/api/students/import")
+async def import_students(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    inserted = 0
+    errors = []
+    last_row = 1
+    # The upload is already spooled to a temp file; rows are parsed one batch at a time off the event loop
+    batches = iter_batches(file.file, file.filename or "", IMPORT_BATCH_SIZE)
+    while True:
+        try:
+            batch = await run_in_threadpool(next, batches, None)
+        except ImportFileError as e:
+            if not inserted and not errors:
+                raise HTTPException(status_code=400, detail=f"Could not read file: {e}")
+            # Earlier batches are already stored; report where reading stopped alongside them
+            errors.append({"row": last_row + 1, "error": f"Could not read file past this point: {e}"})
+            break
+        if batch is None:
+            break
+        last_row = batch[-1][0]
+        
+        students = []
+        row_numbers = []
+        for row_number, row in batch:
+            # Checked before validation so a blank password is never hashed into a usable account
+            missing = [column for column in REQUIRED_COLUMNS if not row[column]]
+            if missing:
+                errors.append({"row": row_number, "error": "; ".join(f"{column} is required" for column in missing)})
+                continue
+            try:
+                student = User(**row, role="student")
+            except ValidationError as e:
+                # Only field names and messages: str(e) would echo the row, password included
+                message = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                errors.append({"row": row_number, "error": message})
+                continue
+            if not student.student_id:
+                student.student_id = None
+            students.append(student)
+            row_numbers.append(row_number)
+        if not students:
+            continue
+        
+        hashes = await asyncio.gather(*(passwords.hash_password(student.password) for student in students))
+        documents = []
+        for student, hashed in zip(students, hashes):
+            student.password = hashed
+            documents.append(student.dict())
+        
+        try:
+            result = await users_collection.insert_many(documents, ordered=False)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted += e.details["nInserted"]
+            for write_error in e.details["writeErrors"]:
+                message = "Username already exists" if write_error["code"] == 11000 else write_error["errmsg"]
+                errors.append({"row": row_numbers[write_error["index"]], "error": message})
+    
+    await increment(db, GLOBAL_KEY, total_students=inserted)
+    errors.sort(key=lambda error: error["row"])
+    return {"inserted": inserted, "failed": len(errors), "errors": errors}
+
 @app.put("/api/students/{student_id}")
-async def update_student(student_id: str, student: User, current_user: dict = Depends(get_current_user)):
+async def update_student(student_id: str, student: User, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "kaprodi":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    users_collection.update_one(
+    # The path decides which user is updated; the password is stored hashed like everywhere else
+    update = student.dict(exclude={"id"})
+    update["password"] = await passwords.hash_password(student.password)
+    previous = await users_collection.find_one_and_update(
         {"id": student_id},
-        {"$set": student.dict()}
+        {"$set": update},
+        projection={"_id": 0, "full_name": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    user_cache.invalidate(student_id)
+    await versions.bump("users")
+    if previous and previous["full_name"] != student.full_name:
+        # Renames are fanned out to the denormalized listings after the response is sent
+        background_tasks.add_task(propagate_student_name, db, student_id, student.full_name)
     return {"message": "Student updated successfully"}
 
 @app.delete("/api/students/{student_id}")
@@ -287,18 +731,54 @@ async def delete_student(student_id: str, current_user: dict = Depends(get_curre
     if current_user["role"] != "kaprodi":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    users_collection.delete_one({"id": student_id})
+    deleted = await users_collection.find_one_and_delete({"id": student_id}, projection={"role": 1})
+    if deleted and deleted["role"] == "student":
+        await increment(db, GLOBAL_KEY, total_students=-1)
+    user_cache.invalidate(student_id)
+    await versions.bump("users")
     return {"message": "Student deleted successfully"}
 
 # Internship programs
+def internships_key(request: Request, limit: int, after: Optional[str], order: str, status: Optional[str],
+                    since: Optional[datetime], until: Optional[datetime], fields: Optional[str], **_):
+    # The catalogue is the same for every role; If-None-Match decides between a 304 and a body
+    return (limit, after, order, status, since, until, fields, request.headers.get("if-none-match"))
+
 @app.get("/api/internships")
-async def get_internships(current_user: dict = Depends(get_current_user)):
-    internships = list(internships_collection.find({}))
-    # Convert MongoDB ObjectId to string for JSON serialization
-    for internship in internships:
-        if "_id" in internship:
-            del internship["_id"]
-    return internships
+@single_flight.coalesce(internships_key, window=SINGLE_FLIGHT_WINDOW)
+async def get_internships(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    # The catalogue only changes through the internship write endpoints, which bump its version
+    not_modified = await versions.not_modified("internships", request, response)
+    if not_modified:
+        return not_modified
+    
+    projection = build_projection(fields, ["id", "created_at"], [])
+    since, until = naive_utc(since), naive_utc(until)
+    if internship_cache.loaded:
+        internships = internship_cache.all()
+        if status:
+            internships = [doc for doc in internships if doc.get("status") == status]
+        if since:
+            internships = [doc for doc in internships if doc["created_at"] >= since]
+        if until:
+            internships = [doc for doc in internships if doc["created_at"] < until]
+        return json_list(paginate_cached(internships, "created_at", projection, limit, after, response, order == "desc"), response)
+    
+    query = date_range_filter({}, "created_at", since, until)
+    if status:
+        query["status"] = status
+    return json_list(await paginate(internships_collection, query, "created_at", projection, limit, after, response, order == "desc"), response)
 
 @app.post("/api/internships")
 async def create_internship(internship: InternshipProgram, current_user: dict = Depends(get_current_user)):
@@ -306,18 +786,26 @@ async def create_internship(internship: InternshipProgram, current_user: dict =
         raise HTTPException(status_code=403, detail="Access denied")
     
     internship.created_by = current_user["id"]
-    internships_collection.insert_one(internship.dict())
+    internship.seats_taken = 0
+    await internships_collection.insert_one(internship.dict())
+    await internship_changed(internship.id)
+    await increment(db, GLOBAL_KEY, total_internships=1)
     return {"message": "Internship program created successfully"}
 
 @app.put("/api/internships/{internship_id}")
-async def update_internship(internship_id: str, internship: InternshipProgram, current_user: dict = Depends(get_current_user)):
+async def update_internship(internship_id: str, internship: InternshipProgram, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "kaprodi":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    internships_collection.update_one(
+    previous = await internships_collection.find_one_and_update(
         {"id": internship_id},
-        {"$set": internship.dict()}
+        {"$set": internship.dict(exclude={"seats_taken"})},
+        projection={"_id": 0, "title": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    await internship_changed(internship_id)
+    if previous and previous["title"] != internship.title:
+        background_tasks.add_task(propagate_internship_title, db, internship_id, internship.title)
     return {"message": "Internship program updated successfully"}
 
 @app.delete("/api/internships/{internship_id}")
@@ -325,81 +813,172 @@ async def delete_internship(internship_id: str, current_user: dict = Depends(get
     if current_user["role"] != "kaprodi":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    internships_collection.delete_one({"id": internship_id})
+    result = await internships_collection.delete_one({"id": internship_id})
+    await versions.bump("internships")
+    internship_cache.discard(internship_id)
+    await increment(db, GLOBAL_KEY, total_internships=-result.deleted_count)
     return {"message": "Internship program deleted successfully"}
 
 # Applications
+def needs_duplicate_check() -> bool:
+    # In mixed UUID storage the unique index sees a string and a binary reference as different keys,
+    # so a student could apply twice while the migration runs; otherwise the index is enough
+    if UUID_STORAGE == "mixed":
+        return True
+    # ...unless it could not be built at startup
+    return any(
+        failure["collection"] == "applications" and failure["name"] == "student_internship_unique"
+        for failure in getattr(app.state, "index_failures", [])
+    )
+
 @app.post("/api/applications")
 async def apply_internship(application: Application, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "student":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Check if already applied
-    existing_application = applications_collection.find_one({
-        "student_id": current_user["id"],
-        "internship_id": application.internship_id
-    })
-    if existing_application:
-        raise HTTPException(status_code=400, detail="Already applied to this internship")
+    # Approval is what takes a seat; this only turns away applications to programs already full
+    internship = await internships_collection.find_one(
+        {"id": application.internship_id}, {"_id": 0, "title": 1, "max_students": 1, "seats_taken": 1}
+    )
+    if not internship:
+        raise HTTPException(status_code=404, detail="Internship not found")
+    if internship.get("seats_taken", 0) >= internship["max_students"]:
+        raise HTTPException(status_code=409, detail="Internship has no seats left")
     
+    # The unique (student_id, internship_id) index rejects duplicate applications
     application.student_id = current_user["id"]
-    applications_collection.insert_one(application.dict())
+    application.status = "pending"
+    if needs_duplicate_check():
+        existing = await applications_collection.find_one(
+            {"student_id": current_user["id"], "internship_id": application.internship_id}, {"_id": 1}
+        )
+        if existing:
+            raise HTTPException(status_code=400, detail="Already applied to this internship")
+    document = application.dict()
+    document["student_name"] = current_user["full_name"]
+    document["internship_title"] = internship["title"]
+    try:
+        await applications_collection.insert_one(document)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already applied to this internship")
+    await versions.bump("applications")
+    await increment(db, GLOBAL_KEY, pending_applications=1)
+    await increment(db, student_key(current_user["id"]), applications=1)
     return {"message": "Application submitted successfully"}
 
 @app.get("/api/applications")
-async def get_applications(current_user: dict = Depends(get_current_user)):
+async def get_applications(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    status: Optional[str] = None,
+    internship_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    query = date_range_filter({}, "applied_at", since, until)
+    if status:
+        query["status"] = status
+    if internship_id:
+        query["internship_id"] = internship_id
+    projection = build_projection(fields, ["id", "student_id", "internship_id", "student_name", "internship_title", "applied_at"], ["decision_id"])
     if current_user["role"] == "kaprodi":
-        applications = list(applications_collection.find({}))
-        # Get student and internship details
-        for app in applications:
-            if "_id" in app:
-                del app["_id"]
-            student = users_collection.find_one({"id": app["student_id"]})
-            internship = internships_collection.find_one({"id": app["internship_id"]})
-            app["student_name"] = student["full_name"] if student else "Unknown"
-            app["internship_title"] = internship["title"] if internship else "Unknown"
+        applications = await paginate(applications_collection, query, "applied_at", projection, limit, after, response, order == "desc")
+        await resolve_names(applications)
     else:
-        applications = list(applications_collection.find({"student_id": current_user["id"]}))
-        for app in applications:
-            if "_id" in app:
-                del app["_id"]
-            internship = internships_collection.find_one({"id": app["internship_id"]})
-            app["internship_title"] = internship["title"] if internship else "Unknown"
+        query["student_id"] = current_user["id"]
+        applications = await paginate(applications_collection, query, "applied_at", projection, limit, after, response, order == "desc")
+        await resolve_names(applications, include_student=False)
     
-    return applications
+    return json_list(applications, response)
 
 @app.put("/api/applications/{application_id}/status")
 async def update_application_status(application_id: str, status: str = Form(...), current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "kaprodi":
         raise HTTPException(status_code=403, detail="Access denied")
+    if status not in APPLICATION_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(APPLICATION_STATUSES)}")
     
-    applications_collection.update_one(
-        {"id": application_id},
-        {"$set": {"status": status}}
-    )
+    try:
+        previous = await change_application_status(applications_collection, internships_collection, application_id, status)
+    except SeatsFull:
+        raise HTTPException(status_code=409, detail="Internship has no seats left")
+    except StatusConflict:
+        raise HTTPException(status_code=409, detail="Application was changed concurrently, please retry")
+    if previous and previous["status"] != status:
+        await versions.bump("applications")
+        if "approved" in (status, previous["status"]):
+            await internship_changed(previous["internship_id"])
+        await increment(db, GLOBAL_KEY, pending_applications=int(status == "pending") - int(previous["status"] == "pending"))
+        await broker.publish(previous["student_id"], "application_status", {
+            "application_id": application_id,
+            "internship_id": previous["internship_id"],
+            "status": status
+        })
     return {"message": "Application status updated successfully"}
 
+@app.put("/api/applications/status")
+async def bulk_update_application_status(update: BulkStatusUpdate, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    decisions = [decision.dict() for decision in update.decisions]
+    results = await change_application_statuses(applications_collection, internships_collection, decisions)
+    
+    updated = [result for result in results if result["result"] == "updated"]
+    if updated:
+        await versions.bump("applications")
+    pending_delta = sum(int(r["status"] == "pending") - int(r["previous_status"] == "pending") for r in updated)
+    await increment(db, GLOBAL_KEY, pending_applications=pending_delta)
+    for internship_id in {r["internship_id"] for r in updated if "approved" in (r["status"], r["previous_status"])}:
+        await internship_changed(internship_id)
+    for result in updated:
+        await broker.publish(result["student_id"], "application_status", {
+            "application_id": result["application_id"],
+            "internship_id": result["internship_id"],
+            "status": result["status"]
+        })
+    
+    return {
+        "updated": len(updated),
+        "failed": sum(result["result"] not in ("updated", "unchanged") for result in results),
+        "results": results
+    }
+
 # Reports
 @app.get("/api/reports")
-async def get_reports(current_user: dict = Depends(get_current_user)):
+async def get_reports(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    status: Optional[str] = None,
+    internship_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    query = date_range_filter({}, "submitted_at", since, until)
+    if status:
+        query["status"] = status
+    if internship_id:
+        query["internship_id"] = internship_id
+    # Report bodies are only returned when explicitly requested through `fields`
+    excluded = [] if fields and "content" in [name.strip() for name in fields.split(",")] else ["content"]
+    projection = build_projection(fields, ["id", "student_id", "internship_id", "student_name", "internship_title", "submitted_at"], excluded)
     if current_user["role"] == "kaprodi":
-        reports = list(reports_collection.find({}))
-        for report in reports:
-            if "_id" in report:
-                del report["_id"]
-            student = users_collection.find_one({"id": report["student_id"]})
-            internship = internships_collection.find_one({"id": report["internship_id"]})
-            report["student_name"] = student["full_name"] if student else "Unknown"
-            report["internship_title"] = internship["title"] if internship else "Unknown"
+        reports = await paginate(reports_collection, query, "submitted_at", projection, limit, after, response, order == "desc")
+        await resolve_names(reports)
     else:
-        reports = list(reports_collection.find({"student_id": current_user["id"]}))
-        for report in reports:
-            if "_id" in report:
-                del report["_id"]
-            internship = internships_collection.find_one({"id": report["internship_id"]})
-            report["internship_title"] = internship["title"] if internship else "Unknown"
+        query["student_id"] = current_user["id"]
+        reports = await paginate(reports_collection, query, "submitted_at", projection, limit, after, response, order == "desc")
+        await resolve_names(reports, include_student=False)
     
-    return reports
+    return json_list(reports, response)
 
 @app.post("/api/reports")
 async def create_report(report: Report, current_user: dict = Depends(get_current_user)):
@@ -407,30 +986,87 @@ async def create_report(report: Report, current_user: dict = Depends(get_current
         raise HTTPException(status_code=403, detail="Access denied")
     
     report.student_id = current_user["id"]
-    reports_collection.insert_one(report.dict())
+    document = report.dict()
+    document["student_name"] = current_user["full_name"]
+    await reports_collection.insert_one(await with_display_names(document))
+    await versions.bump("reports")
+    await increment(db, GLOBAL_KEY, total_reports=1)
+    await increment(db, student_key(current_user["id"]), reports=1)
+    await broker.publish("role:kaprodi", "report_submitted", {
+        "report_id": report.id,
+        "student_id": current_user["id"],
+        "student_name": current_user["full_name"],
+        "internship_id": report.internship_id,
+        "title": report.title,
+        "submitted_at": report.submitted_at
+    })
     return {"message": "Report submitted successfully"}
 
+@app.post("/api/reports/{report_id}/attachment")
+async def upload_report_attachment(report_id: str, file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "student":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    report = await reports_collection.find_one({"id": report_id, "student_id": current_user["id"]}, {"_id": 1})
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    
+    sha256, size = await store_upload(file)
+    await reports_collection.update_one(
+        {"id": report_id},
+        {"$set": {
+            "file_path": sha256,
+            "file_name": file.filename,
+            "file_size": size,
+            "file_sha256": sha256,
+            "file_content_type": file.content_type or "application/octet-stream"
+        }}
+    )
+    return {"message": "Attachment uploaded successfully", "file_size": size, "file_sha256": sha256}
+
+@app.get("/api/reports/{report_id}/attachment")
+async def download_report_attachment(report_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    query = {"id": report_id}
+    if current_user["role"] != "kaprodi":
+        query["student_id"] = current_user["id"]
+    
+    report = await reports_collection.find_one(query, {"_id": 0, "file_sha256": 1, "file_name": 1, "file_content_type": 1})
+    if not report or not report.get("file_sha256"):
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    
+    return attachment_response(
+        request,
+        report["file_sha256"],
+        report.get("file_name") or report["file_sha256"],
+        report.get("file_content_type") or "application/octet-stream"
+    )
+
 # Evaluations
 @app.get("/api/evaluations")
-async def get_evaluations(current_user: dict = Depends(get_current_user)):
+async def get_evaluations(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    internship_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    query = date_range_filter({}, "evaluated_at", since, until)
+    if internship_id:
+        query["internship_id"] = internship_id
+    projection = build_projection(fields, ["id", "student_id", "internship_id", "student_name", "internship_title", "evaluated_at"], [])
     if current_user["role"] == "kaprodi":
-        evaluations = list(evaluations_collection.find({}))
-        for eval in evaluations:
-            if "_id" in eval:
-                del eval["_id"]
-            student = users_collection.find_one({"id": eval["student_id"]})
-            internship = internships_collection.find_one({"id": eval["internship_id"]})
-            eval["student_name"] = student["full_name"] if student else "Unknown"
-            eval["internship_title"] = internship["title"] if internship else "Unknown"
+        evaluations = await paginate(evaluations_collection, query, "evaluated_at", projection, limit, after, response, order == "desc")
+        await resolve_names(evaluations)
     else:
-        evaluations = list(evaluations_collection.find({"student_id": current_user["id"]}))
-        for eval in evaluations:
-            if "_id" in eval:
-                del eval["_id"]
-            internship = internships_collection.find_one({"id": eval["internship_id"]})
-            eval["internship_title"] = internship["title"] if internship else "Unknown"
+        query["student_id"] = current_user["id"]
+        evaluations = await paginate(evaluations_collection, query, "evaluated_at", projection, limit, after, response, order == "desc")
+        await resolve_names(evaluations, include_student=False)
     
-    return evaluations
+    return json_list(evaluations, response)
 
 @app.post("/api/evaluations")
 async def create_evaluation(evaluation: Evaluation, current_user: dict = Depends(get_current_user)):
@@ -438,9 +1074,201 @@ async def create_evaluation(evaluation: Evaluation, current_user: dict = Depends
         raise HTTPException(status_code=403, detail="Access denied")
     
     evaluation.evaluated_by = current_user["id"]
-    evaluations_collection.insert_one(evaluation.dict())
+    await evaluations_collection.insert_one(await with_display_names(evaluation.dict()))
+    await versions.bump("evaluations")
+    await increment(db, student_key(evaluation.student_id), evaluations=1)
+    await broker.publish(evaluation.student_id, "evaluation_created", {
+        "evaluation_id": evaluation.id,
+        "internship_id": evaluation.internship_id,
+        "grade": evaluation.grade,
+        "evaluated_at": evaluation.evaluated_at
+    })
     return {"message": "Evaluation created successfully"}
 
+@app.post("/api/evaluations/bulk")
+async def bulk_create_evaluations(bulk: BulkEvaluations, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    documents = []
+    for evaluation in bulk.evaluations:
+        evaluation.evaluated_by = current_user["id"]
+        documents.append(evaluation.dict())
+    await resolve_names(documents)
+    
+    failed = {}
+    try:
+        await evaluations_collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details["writeErrors"]:
+            failed[write_error["index"]] = "Duplicate evaluation id" if write_error["code"] == 11000 else write_error["errmsg"]
+    
+    if len(failed) < len(documents):
+        await versions.bump("evaluations")
+    
+    results = []
+    per_student = {}
+    for index, evaluation in enumerate(bulk.evaluations):
+        if index in failed:
+            results.append({"id": evaluation.id, "student_id": evaluation.student_id, "result": "error", "error": failed[index]})
+            continue
+        results.append({"id": evaluation.id, "student_id": evaluation.student_id, "result": "created"})
+        key = student_key(evaluation.student_id)
+        per_student.setdefault(key, {"evaluations": 0})["evaluations"] += 1
+        await broker.publish(evaluation.student_id, "evaluation_created", {
+            "evaluation_id": evaluation.id,
+            "internship_id": evaluation.internship_id,
+            "grade": evaluation.grade,
+            "evaluated_at": evaluation.evaluated_at
+        })
+    await increment_many(db, per_student)
+    
+    return {"created": len(documents) - len(failed), "failed": len(failed), "results": results}
+
+# Search
+MAX_SEARCH_RESULTS = 100
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    scope: str = Query("all", pattern="^(all|internships|reports)$"),
+    internship_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0, le=1000),
+    current_user: dict = Depends(get_current_user),
+):
+    # Text indexes rank by relevance, so pages are offset-based rather than keyset
+    score = {"score": {"$meta": "textScore"}}
+    results = {}
+    
+    if scope in ("all", "internships"):
+        query = {"$text": {"$search": q}}
+        cursor = internships_collection.find(query, {"_id": 0, **score}).sort([("score", {"$meta": "textScore"})])
+        results["internships"] = await cursor.skip(offset).limit(limit).to_list(length=limit)
+    
+    if scope in ("all", "reports"):
+        query = {"$text": {"$search": q}}
+        if internship_id:
+            query["internship_id"] = internship_id
+        # Students only ever search their own reports
+        if current_user["role"] != "kaprodi":
+            query["student_id"] = current_user["id"]
+        cursor = reports_collection.find(query, {"_id": 0, "content": 0, **score}).sort([("score", {"$meta": "textScore"})])
+        reports = await cursor.skip(offset).limit(limit).to_list(length=limit)
+        results["reports"] = await resolve_names(reports, include_student=current_user["role"] == "kaprodi")
+    
+    return results
+
+# Server-Sent Events
+@app.post("/api/events/ticket")
+async def issue_stream_ticket(current_user: dict = Depends(get_current_user)):
+    return {"ticket": create_stream_ticket(current_user["id"]), "expires_in": STREAM_TICKET_TTL}
+
+@app.get("/api/events")
+async def stream_events(request: Request, current_user: dict = Depends(get_stream_user)):
+    topics = [current_user["id"], f"role:{current_user['role']}"]
+    return StreamingResponse(
+        event_stream(broker, topics, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Exports
+@app.get("/api/export/{collection}")
+async def export_collection(
+    collection: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    sources = {
+        "applications": (applications_collection, "applied_at"),
+        "reports": (reports_collection, "submitted_at"),
+        "evaluations": (evaluations_collection, "evaluated_at"),
+    }
+    if collection not in sources:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    
+    source, date_field = sources[collection]
+    query = date_range_filter({}, date_field, since, until)
+    cursor = source.find(query, {"_id": 0}).sort([(date_field, 1), ("id", 1)]).batch_size(EXPORT_BATCH_SIZE)
+    filename = f"{collection}-{datetime.now():%Y%m%d}.{format}"
+    return StreamingResponse(
+        stream_export(cursor, EXPORT_COLUMNS[collection], format, resolve_names),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# Admin
+@app.get("/api/admin/indexes")
+async def get_index_report(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    report = await check_indexes(db)
+    report["failed_at_startup"] = getattr(app.state, "index_failures", [])
+    return report
+
+@app.post("/api/admin/read-model/verify")
+async def verify_denormalized_fields(repair: bool = False, current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    if UUID_STORAGE == "mixed":
+        # $lookup cannot match string references to binary ids, so unmigrated documents would
+        # all look drifted and a repair would rename them to "Unknown"
+        raise HTTPException(status_code=409, detail="Read model cannot be verified while UUID storage is being migrated")
+    
+    return await verify_read_model(db, repair=repair)
+
+@app.get("/api/admin/cache")
+async def get_cache_stats(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return {
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+        "internships": internship_cache.stats(),
+        "events": broker.stats(),
+        "analytics": analytics_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "rate_limits": rate_limiter.stats()
+    }
+
+@app.get("/api/admin/hashing")
+async def get_hashing_stats(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "kaprodi":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return passwords.stats.snapshot()
+
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    
+    parser = argparse.ArgumentParser(description="Run the internship monitoring API")
+    parser.add_argument("--host", default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument("--port", type=int, default=int(os.environ.get('PORT', '8001')))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get('WEB_CONCURRENCY', '1')))
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.environ.get('GRACEFUL_TIMEOUT', '30')),
+                        help="seconds to let in-flight requests finish on shutdown")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        # Workers re-import this module, so per-worker settings are passed through the environment
+        total_pool = os.environ.get('MONGO_TOTAL_POOL_SIZE')
+        if total_pool and 'MONGO_MAX_POOL_SIZE' not in os.environ:
+            os.environ['MONGO_MAX_POOL_SIZE'] = str(max(int(total_pool) // args.workers, 1))
+        uvicorn.run(
+            "server:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            timeout_graceful_shutdown=args.graceful_timeout
+        )
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, timeout_graceful_shutdown=args.graceful_timeout)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+import functools
+from collections import defaultdict
+from typing import Callable, Dict, Hashable
+
+from fastapi import Response
+
+from cache import TTLCache
+
+
+def _copy_response(response: Response) -> Response:
+    # Middleware mutates header lists in place, so every caller gets its own Response object
+    return Response(
+        content=response.body,
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        media_type=response.media_type,
+    )
+
+
+class SingleFlight:
+    """Lets concurrent identical calls share one execution and its result.
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it runs await the same task instead of repeating the query. With a result
+    window, a finished result is also served to callers arriving within that
+    many seconds. The task is shielded, so a leader disconnecting does not
+    cancel the work its followers are waiting on.
+    """
+
+    def __init__(self, window_cache_size: int = 1024):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._recent = TTLCache(maxsize=window_cache_size, ttl=1.0)
+        # handler -> [calls, executions, coalesced, window hits]
+        self._counts: Dict[str, list] = defaultdict(lambda: [0, 0, 0, 0])
+
+    async def do(self, name: str, key: Hashable, call: Callable, window: float = 0.0):
+        counts = self._counts[name]
+        counts[0] += 1
+        key = (name, key)
+        if window:
+            cached = self._recent.get(key)
+            if cached is not None:
+                counts[3] += 1
+                return cached[0]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            counts[1] += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key, window))
+        else:
+            counts[2] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, window: float, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if window and not task.cancelled() and task.exception() is None:
+            self._recent.set(key, (task.result(),), ttl=window)
+
+    def coalesce(self, key: Callable[..., Hashable], window: float = 0.0):
+        """Decorate an endpoint so concurrent calls with equal `key(**kwargs)` share one execution.
+
+        `key` receives the endpoint's keyword arguments and must capture everything the
+        result depends on (query parameters, the caller's role or id, conditional headers).
+        """
+        # TTLCache caps per-entry TTLs at its own, so it has to allow the longest window in use
+        self._recent.ttl = max(self._recent.ttl, window)
+
+        def decorator(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(**kwargs):
+                result = await self.do(endpoint.__name__, key(**kwargs), lambda: endpoint(**kwargs), window)
+                return _copy_response(result) if isinstance(result, Response) else result
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        handlers = {}
+        for name, (calls, executions, coalesced, window_hits) in self._counts.items():
+            handlers[name] = {
+                "calls": calls,
+                "executions": executions,
+                "coalesced": coalesced,
+                "window_hits": window_hits,
+                "coalescing_ratio": round((coalesced + window_hits) / calls, 4) if calls else 0.0,
+            }
+        return {"in_flight": len(self._in_flight), "handlers": handlers}
+
+    def render(self) -> str:
+        lines = [
+            "# TYPE single_flight_calls_total counter",
+            "# TYPE single_flight_executions_total counter",
+            "# TYPE single_flight_coalescing_ratio gauge",
+        ]
+        for name, handler in sorted(self.stats()["handlers"].items()):
+            lines.append(f'single_flight_calls_total{{handler="{name}"}} {handler["calls"]}')
+            lines.append(f'single_flight_executions_total{{handler="{name}"}} {handler["executions"]}')
+            lines.append(f'single_flight_coalescing_ratio{{handler="{name}"}} {handler["coalescing_ratio"]}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,67 @@
+import csv
+import io
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+IMPORT_COLUMNS = ["username", "email", "password", "full_name", "student_id"]
+# Missing columns and blank cells read as ""; only student_id may stay empty
+REQUIRED_COLUMNS = ["username", "email", "password", "full_name"]
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        # The reader skips blank lines, so rows are numbered by the line they end on
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        text.detach()
+
+
+def _xlsx_rows(stream: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    from openpyxl import load_workbook
+
+    # read_only mode streams rows from the sheet XML instead of loading the workbook
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, [])]
+        # Blank rows are skipped but still counted, so numbers match the sheet
+        for row_number, values in enumerate(rows, start=2):
+            if values is None or all(value is None for value in values):
+                continue
+            yield row_number, {
+                name: "" if value is None else str(value)
+                for name, value in zip(header, values)
+            }
+    finally:
+        workbook.close()
+
+
+def iter_rows(stream: BinaryIO, filename: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    if filename.lower().endswith(".xlsx"):
+        return _xlsx_rows(stream)
+    return _csv_rows(stream)
+
+
+def iter_batches(stream: BinaryIO, filename: str, size: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    # Rows are numbered as they appear in the file, header being row 1
+    batch = []
+    try:
+        for row_number, row in iter_rows(stream, filename):
+            batch.append((row_number, {
+                column: (row.get(column) or "").strip()
+                for column in IMPORT_COLUMNS
+            }))
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    except (ValueError, KeyError, csv.Error, zipfile.BadZipFile) as e:
+        raise ImportFileError(str(e)) from e
+    if batch:
+        yield batch
@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import logging
+import os
+import uuid
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from pymongo import DeleteMany, DeleteOne, InsertOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# UUID-valued fields per collection. users.student_id is the student number, not a UUID.
+ID_FIELDS = {
+    "users": ("id",),
+    "internships": ("id", "created_by"),
+    "applications": ("id", "student_id", "internship_id"),
+    "reports": ("id", "student_id", "internship_id"),
+    "evaluations": ("id", "student_id", "internship_id", "evaluated_by"),
+}
+
+# string: 36-character strings (the original layout)
+# mixed: write binary, match both forms on lookups; run the app like this while migrating
+#   (read-model verification joins on these fields, so leave it until the migration is done)
+# binary: write and match binary UUIDs only
+STORAGE_MODES = ("string", "mixed", "binary")
+
+MIGRATION_BATCH_SIZE = 1000
+
+_COMPARISONS = ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte")
+
+
+def to_uuid(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            return value
+    return value
+
+
+def to_strings(value: Any) -> Any:
+    """Replace UUIDs anywhere in a document (or aggregation/change stream result) with strings."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: to_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_strings(item) for item in value]
+    return value
+
+
+class _Cursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, *args):
+        self._cursor.limit(*args)
+        return self
+
+    def skip(self, *args):
+        self._cursor.skip(*args)
+        return self
+
+    def batch_size(self, *args):
+        self._cursor.batch_size(*args)
+        return self
+
+    async def to_list(self, length: Optional[int] = None):
+        return [to_strings(doc) for doc in await self._cursor.to_list(length=length)]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return to_strings(await self._cursor.__anext__())
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _ChangeStream:
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def __aenter__(self):
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._stream.__aexit__(*exc_info)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return to_strings(await self._stream.__anext__())
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class UUIDCollection:
+    """Collection proxy storing UUID fields as BSON binary (subtype 4) while callers use strings.
+
+    Filters, inserted documents, updates and bulk operations have their UUID fields
+    converted on the way in; every result has UUIDs converted back to strings, so the
+    rest of the code and the API never see the binary form.
+    """
+
+    def __init__(self, collection, fields: Iterable[str], match_strings: bool):
+        self._collection = collection
+        self._fields = frozenset(fields)
+        self._match_strings = match_strings
+
+    def _condition(self, value):
+        if isinstance(value, str):
+            binary = to_uuid(value)
+            if self._match_strings and binary is not value:
+                return {"$in": [binary, value]}
+            return binary
+        if isinstance(value, dict):
+            converted = {}
+            for operator, operand in value.items():
+                if operator in ("$in", "$nin"):
+                    converted[operator] = [to_uuid(item) for item in operand]
+                    if self._match_strings:
+                        converted[operator] += [item for item in operand if isinstance(item, str)]
+                elif operator in _COMPARISONS:
+                    converted[operator] = to_uuid(operand)
+                else:
+                    converted[operator] = operand
+            return converted
+        return value
+
+    def _filter(self, query):
+        if not isinstance(query, dict):
+            return query
+        converted = {}
+        for key, value in query.items():
+            if key in ("$and", "$or", "$nor"):
+                converted[key] = [self._filter(clause) for clause in value]
+            elif key in self._fields:
+                converted[key] = self._condition(value)
+            else:
+                converted[key] = value
+        return converted
+
+    def _document(self, document: dict) -> dict:
+        # A copy, so pymongo adds _id to it rather than to the caller's dict
+        return {key: to_uuid(value) if key in self._fields else value for key, value in document.items()}
+
+    def _update(self, update):
+        if isinstance(update, list):
+            return [self._update(stage) for stage in update]
+        if not any(key.startswith("$") for key in update):
+            return self._document(update)
+        return {
+            operator: self._document(fields) if operator in ("$set", "$setOnInsert") else fields
+            for operator, fields in update.items()
+        }
+
+    def _pipeline(self, pipeline):
+        return [{"$match": self._filter(stage["$match"])} if "$match" in stage else stage for stage in pipeline]
+
+    def _operation(self, operation):
+        # pymongo operations keep their arguments in private attributes
+        if isinstance(operation, InsertOne):
+            return InsertOne(self._document(operation._doc))
+        if isinstance(operation, (UpdateOne, UpdateMany)):
+            return type(operation)(self._filter(operation._filter), self._update(operation._doc), upsert=operation._upsert)
+        if isinstance(operation, (DeleteOne, DeleteMany)):
+            return type(operation)(self._filter(operation._filter))
+        return operation
+
+    def find(self, filter=None, *args, **kwargs):
+        return _Cursor(self._collection.find(self._filter(filter or {}), *args, **kwargs))
+
+    async def find_one(self, filter=None, *args, **kwargs):
+        return to_strings(await self._collection.find_one(self._filter(filter or {}), *args, **kwargs))
+
+    async def find_one_and_update(self, filter, update, *args, **kwargs):
+        return to_strings(await self._collection.find_one_and_update(self._filter(filter), self._update(update), *args, **kwargs))
+
+    async def find_one_and_delete(self, filter, *args, **kwargs):
+        return to_strings(await self._collection.find_one_and_delete(self._filter(filter), *args, **kwargs))
+
+    async def count_documents(self, filter, *args, **kwargs):
+        return await self._collection.count_documents(self._filter(filter), *args, **kwargs)
+
+    async def insert_one(self, document, *args, **kwargs):
+        return await self._collection.insert_one(self._document(document), *args, **kwargs)
+
+    async def insert_many(self, documents, *args, **kwargs):
+        return await self._collection.insert_many([self._document(document) for document in documents], *args, **kwargs)
+
+    async def update_one(self, filter, update, *args, **kwargs):
+        return await self._collection.update_one(self._filter(filter), self._update(update), *args, **kwargs)
+
+    async def update_many(self, filter, update, *args, **kwargs):
+        return await self._collection.update_many(self._filter(filter), self._update(update), *args, **kwargs)
+
+    async def delete_one(self, filter, *args, **kwargs):
+        return await self._collection.delete_one(self._filter(filter), *args, **kwargs)
+
+    async def delete_many(self, filter, *args, **kwargs):
+        return await self._collection.delete_many(self._filter(filter), *args, **kwargs)
+
+    async def bulk_write(self, operations, *args, **kwargs):
+        return await self._collection.bulk_write([self._operation(operation) for operation in operations], *args, **kwargs)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        return _Cursor(self._collection.aggregate(self._pipeline(pipeline), *args, **kwargs))
+
+    def watch(self, pipeline=None, *args, **kwargs):
+        return _ChangeStream(self._collection.watch(self._pipeline(pipeline or []), *args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class UUIDDatabase:
+    """Database proxy handing out UUIDCollection for collections with UUID fields."""
+
+    def __init__(self, db, match_strings: bool):
+        self._db = db
+        self._collections: Dict[str, UUIDCollection] = {
+            name: UUIDCollection(db[name], fields, match_strings) for name, fields in ID_FIELDS.items()
+        }
+
+    def __getitem__(self, name: str):
+        return self._collections.get(name) or self._db[name]
+
+    def __getattr__(self, name: str):
+        if name in ID_FIELDS:
+            return self._collections[name]
+        return getattr(self._db, name)
+
+
+def storage_database(db, mode: str):
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"UUID_STORAGE must be one of: {', '.join(STORAGE_MODES)}")
+    if mode == "string":
+        return db
+    return UUIDDatabase(db, match_strings=mode == "mixed")
+
+
+async def index_sizes(db) -> Dict[str, dict]:
+    sizes = {}
+    for name in ID_FIELDS:
+        stats = await db.command("collStats", name)
+        sizes[name] = {
+            "count": stats.get("count", 0),
+            "avg_document_bytes": stats.get("avgObjSize", 0),
+            "data_bytes": stats.get("size", 0),
+            "total_index_bytes": stats.get("totalIndexSize", 0),
+            "index_bytes": stats.get("indexSizes", {}),
+        }
+    return sizes
+
+
+async def migrate_collection(collection, fields: Iterable[str], batch_size: int = MIGRATION_BATCH_SIZE) -> Tuple[int, list]:
+    """Convert string UUID fields to binary in _id order, one bulk_write per batch.
+
+    Safe while the app runs in `mixed` mode: each update only applies if the field still
+    holds the string that was read, and values that are not UUIDs are left alone.
+    Returns the number of converted documents and the documents left as strings because
+    converting them would collide with a unique index (e.g. a duplicate application
+    written in binary form before its string twin was migrated).
+    """
+    fields = list(fields)
+    converted = 0
+    conflicts = []
+    last_id = None
+    while True:
+        query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        if last_id is not None:
+            query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+        batch = await collection.find(query, {field: 1 for field in fields}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return converted, conflicts
+        operations, doc_ids = [], []
+        for doc in batch:
+            changes = {field: to_uuid(doc[field]) for field in fields if isinstance(doc.get(field), str)}
+            changes = {field: value for field, value in changes.items() if isinstance(value, uuid.UUID)}
+            if changes:
+                operations.append(UpdateOne(
+                    {"_id": doc["_id"], **{field: doc[field] for field in changes}},
+                    {"$set": changes}
+                ))
+                doc_ids.append(doc["_id"])
+        if operations:
+            try:
+                result = await collection.bulk_write(operations, ordered=False)
+                converted += result.modified_count
+            except BulkWriteError as e:
+                converted += e.details["nModified"]
+                for write_error in e.details["writeErrors"]:
+                    if write_error["code"] != 11000:
+                        raise
+                    doc_id = doc_ids[write_error["index"]]
+                    logger.warning("%s: %s left unconverted: %s", collection.name, doc_id, write_error["errmsg"])
+                    conflicts.append(doc_id)
+        last_id = batch[-1]["_id"]
+
+
+async def _main(batch_size: int, measure_only: bool, compact: bool) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017/'), uuidRepresentation="standard")
+    db = client[os.environ.get('MONGO_DB_NAME', 'internship_monitoring')]
+    try:
+        before = await index_sizes(db)
+        if not measure_only:
+            for name, fields in ID_FIELDS.items():
+                converted, conflicts = await migrate_collection(db[name], fields, batch_size)
+                print(f"{name}: converted {converted} documents")
+                for doc_id in conflicts:
+                    print(f"  CONFLICT _id={doc_id}: duplicates an existing binary document; resolve it and re-run")
+                if compact:
+                    # Index files keep their freed pages until compacted
+                    await db.command("compact", name)
+        after = await index_sizes(db)
+    finally:
+        client.close()
+
+    for name in ID_FIELDS:
+        old, new = before[name], after[name]
+        print(f"{name}: {new['count']} docs, avg doc {old['avg_document_bytes']} -> {new['avg_document_bytes']} bytes, "
+              f"indexes {old['total_index_bytes']} -> {new['total_index_bytes']} bytes")
+        for index, size in new["index_bytes"].items():
+            print(f"  {index}: {old['index_bytes'].get(index, 0)} -> {size} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert UUID string fields to BSON binary and report storage sizes")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    parser.add_argument("--measure-only", action="store_true", help="only print collection and index sizes")
+    parser.add_argument("--compact", action="store_true", help="compact each collection after converting it")
+    args = parser.parse_args()
+    asyncio.run(_main(args.batch_size, args.measure_only, args.compact))
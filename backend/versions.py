@@ -0,0 +1,60 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from pymongo import ReturnDocument
+
+from cache import TTLCache
+
+
+class CollectionVersions:
+    """Monotonic per-collection version numbers, bumped by every write to that collection.
+
+    Versions live in the counters collection so all workers agree on them; each worker
+    keeps the last value it saw for `refresh_interval` seconds, which bounds how long
+    another worker's write can go unnoticed.
+    """
+
+    def __init__(self, db, refresh_interval: float = 1.0):
+        self.db = db
+        self._local = TTLCache(maxsize=256, ttl=refresh_interval)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"version:{name}"
+
+    async def get(self, name: str) -> int:
+        version = self._local.get(name)
+        if version is None:
+            doc = await self.db.counters.find_one({"_id": self._key(name)})
+            version = doc["version"] if doc else 0
+            self._local.set(name, version)
+        return version
+
+    async def bump(self, name: str) -> int:
+        doc = await self.db.counters.find_one_and_update(
+            {"_id": self._key(name)},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._local.set(name, doc["version"])
+        return doc["version"]
+
+    def forget(self, name: str) -> None:
+        self._local.invalidate(name)
+
+    async def etag(self, name: str, request: Request) -> str:
+        # The query string selects the page/filters, so it is part of the representation
+        query = hashlib.sha1(str(sorted(request.query_params.multi_items())).encode()).hexdigest()[:16]
+        return f'"{name}-{await self.get(name)}-{query}"'
+
+    async def not_modified(self, name: str, request: Request, response: Response) -> Optional[Response]:
+        """Set the ETag on `response`; return a 304 response if the client's copy is current."""
+        etag = await self.etag(name, request)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        return None
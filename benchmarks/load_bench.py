@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Seeded, concurrent mixed-workload benchmark for the backend API.
+
+By default the FastAPI app runs in-process (httpx ASGI transport) against a scratch
+database on a local mongod (MONGO_URL), which is dropped afterwards. Pass --base-url
+to drive an already running server instead (e.g. uvicorn with several workers), in
+which case the scratch database must be the one that server uses (MONGO_DB_NAME),
+and that server should run with RATE_LIMIT_BACKEND=off or most logins are throttled.
+
+Results (p50/p95/p99 latency, throughput, status codes per endpoint) are printed and
+written as JSON; --compare prints the change against an earlier results file.
+
+    python benchmarks/load_bench.py --duration 60
+    python benchmarks/load_bench.py --base-url http://localhost:8001 --db-name internship_monitoring
+    python benchmarks/load_bench.py --compare benchmarks/results/load-<timestamp>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+STUDENT_PASSWORD = "bench-student"
+KAPRODI_PASSWORD = "bench-kaprodi"
+
+# Relative frequency of each operation in the mixed workload
+WORKLOAD = {
+    "login": 5,
+    "dashboard": 25,
+    "internships": 20,
+    "applications": 15,
+    "reports": 15,
+    "evaluations": 5,
+    "apply": 15,
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def seed(db, args, hashed_student, hashed_kaprodi):
+    now = datetime.now()
+    kaprodi_id = str(uuid.uuid4())
+    users = [{
+        "id": kaprodi_id, "username": "bench_kaprodi", "email": "kaprodi@bench.local", "password": hashed_kaprodi,
+        "role": "kaprodi", "full_name": "Bench Kaprodi", "student_id": None, "created_at": now,
+    }]
+    students = []
+    for i in range(args.students):
+        student = {
+            "id": str(uuid.uuid4()), "username": f"bench_student_{i}", "email": f"student{i}@bench.local",
+            "password": hashed_student, "role": "student", "full_name": f"Bench Student {i}",
+            "student_id": f"BENCH{i:06d}", "created_at": now - timedelta(seconds=i),
+        }
+        students.append(student)
+    users += students
+    await db.users.insert_many(users, ordered=False)
+
+    internships = [{
+        "id": str(uuid.uuid4()), "title": f"Program {i}", "company_name": f"Company {i % 50}",
+        "description": "Benchmark internship program", "duration": "6 months", "requirements": "Python",
+        "max_students": 1_000_000, "seats_taken": 0, "status": "active", "created_by": kaprodi_id,
+        "created_at": now - timedelta(minutes=i),
+    } for i in range(args.internships)]
+    await db.internships.insert_many(internships, ordered=False)
+
+    rng = random.Random(args.seed)
+    reports = []
+    for i in range(args.reports):
+        student = students[i % len(students)]
+        reports.append({
+            "id": str(uuid.uuid4()), "student_id": student["id"], "internship_id": rng.choice(internships)["id"],
+            "title": f"Weekly report {i}", "content": "Progress notes. " * 40, "file_path": None,
+            "submitted_at": now - timedelta(minutes=i), "status": "submitted",
+        })
+        if len(reports) >= 5000:
+            await db.reports.insert_many(reports, ordered=False)
+            reports = []
+    if reports:
+        await db.reports.insert_many(reports, ordered=False)
+
+    evaluations = [{
+        "id": str(uuid.uuid4()), "student_id": students[i % len(students)]["id"],
+        "internship_id": rng.choice(internships)["id"], "grade": rng.choice("ABCDE"), "feedback": "Benchmark",
+        "evaluated_by": kaprodi_id, "evaluated_at": now - timedelta(minutes=i),
+    } for i in range(args.evaluations)]
+    if evaluations:
+        await db.evaluations.insert_many(evaluations, ordered=False)
+    return students, internships
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name, seconds, status):
+        self.latencies[name].append(seconds)
+        self.statuses[name][str(status)] += 1
+
+
+async def timed(recorder, name, call):
+    started = time.perf_counter()
+    try:
+        response = await call
+        status = response.status_code
+    except httpx.HTTPError as e:
+        response, status = None, type(e).__name__
+    recorder.record(name, time.perf_counter() - started, status)
+    return response
+
+
+async def login(http, recorder, username, password):
+    response = await timed(recorder, "login", http.post("/api/login", json={"username": username, "password": password}))
+    if response is None or response.status_code != 200:
+        raise RuntimeError(f"Login failed for {username}: {response.status_code if response else 'no response'}")
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+async def worker(http, recorder, rng, deadline, students, internships, kaprodi_headers, student_tokens):
+    operations = list(WORKLOAD)
+    weights = [WORKLOAD[name] for name in operations]
+    while time.perf_counter() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        index = rng.randrange(len(students))
+        as_kaprodi = rng.random() < 0.2
+        headers = kaprodi_headers if as_kaprodi else student_tokens[index]
+        if operation == "login":
+            await timed(recorder, "login", http.post(
+                "/api/login", json={"username": students[index]["username"], "password": STUDENT_PASSWORD}))
+        elif operation == "dashboard":
+            await timed(recorder, "dashboard", http.get("/api/dashboard/stats", headers=headers))
+        elif operation == "apply":
+            await timed(recorder, "apply", http.post(
+                "/api/applications", headers=student_tokens[index],
+                json={"student_id": "", "internship_id": rng.choice(internships)["id"]}))
+        else:
+            await timed(recorder, operation, http.get(f"/api/{operation}", headers=headers))
+
+
+async def run(args):
+    sys.path.insert(0, BACKEND_DIR)
+    db_name = args.db_name or f"load_bench_{uuid.uuid4().hex[:8]}"
+    os.environ["MONGO_DB_NAME"] = db_name
+    # Every simulated client shares one address, so login throttling would reject most of the workload
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "off")
+    mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
+
+    import passwords
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    app = None
+    try:
+        seed_started = time.perf_counter()
+        hashed_student = await passwords.hash_password(STUDENT_PASSWORD)
+        hashed_kaprodi = await passwords.hash_password(KAPRODI_PASSWORD)
+        students, internships = await seed(db, args, hashed_student, hashed_kaprodi)
+        print(f"Seeded {args.students} students, {args.internships} internships, {args.reports} reports, "
+              f"{args.evaluations} evaluations into {db_name} in {time.perf_counter() - seed_started:.1f}s")
+
+        if args.base_url:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+            base_url = args.base_url
+        else:
+            from server import app
+            await app.router.startup()
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+
+        recorder = Recorder()
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as http:
+            kaprodi_headers = await login(http, recorder, "bench_kaprodi", KAPRODI_PASSWORD)
+            token_students = students[:args.token_pool]
+            student_tokens = await asyncio.gather(*(
+                login(http, recorder, student["username"], STUDENT_PASSWORD) for student in token_students))
+            recorder = Recorder()
+
+            rng = random.Random(args.seed)
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                worker(http, recorder, random.Random(rng.random()), deadline, token_students, internships,
+                       kaprodi_headers, student_tokens)
+                for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+        if not args.keep:
+            await client.drop_database(db_name)
+        client.close()
+
+    endpoints = {}
+    for name, values in sorted(recorder.latencies.items()):
+        values.sort()
+        endpoints[name] = {
+            "requests": len(values),
+            "throughput_rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000,
+            "statuses": dict(recorder.statuses[name]),
+        }
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "started_at": datetime.now().isoformat(),
+        "target": args.base_url or "in-process",
+        "python": platform.python_version(),
+        "config": {
+            "students": args.students, "internships": args.internships, "reports": args.reports,
+            "evaluations": args.evaluations, "concurrency": args.concurrency, "duration": args.duration,
+            "seed": args.seed,
+        },
+        "elapsed_s": elapsed,
+        "total_requests": total,
+        "throughput_rps": total / elapsed,
+        "endpoints": endpoints,
+    }
+
+
+def print_results(results, baseline=None):
+    print(f"\n{results['total_requests']} requests in {results['elapsed_s']:.1f}s "
+          f"({results['throughput_rps']:.0f} req/s) at concurrency {results['config']['concurrency']}")
+    print(f"{'endpoint':14s} {'reqs':>7s} {'rps':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}  statuses")
+    for name, endpoint in results["endpoints"].items():
+        line = (f"{name:14s} {endpoint['requests']:7d} {endpoint['throughput_rps']:8.1f} "
+                f"{endpoint['p50_ms']:8.1f} {endpoint['p95_ms']:8.1f} {endpoint['p99_ms']:8.1f}  {endpoint['statuses']}")
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous and previous["p95_ms"]:
+            change = (endpoint["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"  p95 {change:+.0f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--internships", type=int, default=50)
+    parser.add_argument("--reports", type=int, default=5000)
+    parser.add_argument("--evaluations", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of mixed load")
+    parser.add_argument("--token-pool", type=int, default=100, help="students logged in up front to drive authenticated calls")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--db-name", help="database to seed (defaults to a scratch database)")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database afterwards")
+    parser.add_argument("--output", help="results file (default benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+    args.token_pool = min(args.token_pool, args.students)
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Fire thousands of simultaneous applications and approvals at one popular internship.
+
+Runs against a scratch database on a local mongod (MONGO_URL) and checks that the
+conditional seat reservation never approves more students than max_students.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from indexes import ensure_indexes  # noqa: E402
+from seats import SeatsFull, StatusConflict, change_application_status  # noqa: E402
+
+
+async def apply(applications, internship_id: str) -> str:
+    application_id = str(uuid.uuid4())
+    await applications.insert_one({
+        "id": application_id,
+        "student_id": str(uuid.uuid4()),
+        "internship_id": internship_id,
+        "status": "pending",
+    })
+    return application_id
+
+
+async def approve(applications, internships, application_id: str) -> str:
+    try:
+        await change_application_status(applications, internships, application_id, "approved")
+        return "approved"
+    except SeatsFull:
+        return "full"
+    except StatusConflict:
+        return "conflict"
+
+
+async def run(args) -> int:
+    client = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017/'), maxPoolSize=args.pool_size)
+    db_name = f"seat_bench_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+    try:
+        await ensure_indexes(db)
+        internship_id = str(uuid.uuid4())
+        await db.internships.insert_one({"id": internship_id, "title": "Popular program", "max_students": args.seats, "seats_taken": 0})
+
+        started = time.perf_counter()
+        application_ids = await asyncio.gather(*(apply(db.applications, internship_id) for _ in range(args.applicants)))
+        apply_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(approve(db.applications, db.internships, app_id) for app_id in application_ids))
+        approve_elapsed = time.perf_counter() - started
+
+        internship = await db.internships.find_one({"id": internship_id})
+        approved = await db.applications.count_documents({"internship_id": internship_id, "status": "approved"})
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+    print(f"applicants={args.applicants} seats={args.seats}")
+    print(f"apply:   {args.applicants / apply_elapsed:8.0f} req/s ({apply_elapsed:.2f}s)")
+    print(f"approve: {args.applicants / approve_elapsed:8.0f} req/s ({approve_elapsed:.2f}s) "
+          f"approved={outcomes.count('approved')} full={outcomes.count('full')} conflict={outcomes.count('conflict')}")
+    print(f"seats_taken={internship['seats_taken']} approved_in_db={approved}")
+
+    expected = min(args.seats, args.applicants)
+    if internship["seats_taken"] != approved or approved != expected:
+        print(f"FAIL: expected {expected} approved applications holding seats")
+        return 1
+    print("OK: no over-subscription")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applicants", type=int, default=3000)
+    parser.add_argument("--seats", type=int, default=25)
+    parser.add_argument("--pool-size", type=int, default=100)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
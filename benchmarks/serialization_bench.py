@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Compare the old and new JSON serialization paths on a 10k-document listing.
+
+old: per-document `del doc["_id"]`, jsonable_encoder, stdlib json (FastAPI's JSONResponse)
+new: _id excluded by projection, ORJSONResponse rendering the documents directly
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+
+def make_documents(count: int, with_object_id: bool):
+    base = datetime(2024, 1, 1, 8, 0, 0, 123000)
+    docs = []
+    for i in range(count):
+        doc = {
+            "id": str(uuid.uuid4()),
+            "student_id": str(uuid.uuid4()),
+            "internship_id": str(uuid.uuid4()),
+            "title": f"Weekly report {i}",
+            "status": "submitted",
+            "file_path": None,
+            "submitted_at": base + timedelta(minutes=i),
+            "student_name": "Ahmad Mahasiswa",
+            "internship_title": "Software Development Internship",
+        }
+        if with_object_id:
+            doc["_id"] = ObjectId()
+        docs.append(doc)
+    return docs
+
+
+def old_path(docs):
+    for doc in docs:
+        if "_id" in doc:
+            del doc["_id"]
+    return JSONResponse(jsonable_encoder(docs)).body
+
+
+def new_path(docs):
+    return ORJSONResponse(docs).body
+
+
+def measure(fn, make_input, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        docs = make_input()
+        started = time.perf_counter()
+        body = fn(docs)
+        timings.append(time.perf_counter() - started)
+    return timings, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with_id = make_documents(args.documents, with_object_id=True)
+    projected = make_documents(args.documents, with_object_id=False)
+
+    results = {
+        "old (del _id + jsonable_encoder + json)": measure(old_path, lambda: [dict(doc) for doc in with_id], args.repeat),
+        "new (projection + orjson)": measure(new_path, lambda: projected, args.repeat),
+    }
+
+    print(f"{args.documents} documents, {args.repeat} runs")
+    baseline = None
+    for name, (timings, size) in results.items():
+        median = statistics.median(timings) * 1000
+        baseline = baseline or median
+        print(f"{name:45s} median {median:8.2f} ms  p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:8.2f} ms  "
+              f"body {size / 1024:8.1f} KiB  speedup x{baseline / median:.1f}")
+
+
+if __name__ == "__main__":
+    main()
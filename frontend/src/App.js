@@ -3,6 +3,82 @@ import './App.css';
 
 const API_BASE_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 
+// Opens the server-sent event stream and dispatches events to handlers; returns a cleanup function.
+// EventSource cannot send headers, so each connection uses a short-lived ticket instead of the session token.
+function subscribeToEvents(handlers) {
+  let source = null;
+  let retry = null;
+  let closed = false;
+
+  const open = async () => {
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch(`${API_BASE_URL}/api/events/ticket`, {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+      if (!response.ok) {
+        throw new Error(`Stream ticket request returned ${response.status}`);
+      }
+      const { ticket } = await response.json();
+      if (closed) {
+        return;
+      }
+      source = new EventSource(`${API_BASE_URL}/api/events?ticket=${encodeURIComponent(ticket)}`);
+      Object.entries(handlers).forEach(([event, handler]) => {
+        source.addEventListener(event, (message) => handler(JSON.parse(message.data)));
+      });
+      // The ticket expires soon after connecting, so reconnect with a fresh one rather than reusing the URL
+      source.onerror = () => {
+        source.close();
+        if (!closed) {
+          retry = setTimeout(open, 5000);
+        }
+      };
+    } catch (error) {
+      console.error('Error opening event stream:', error);
+      if (!closed) {
+        retry = setTimeout(open, 5000);
+      }
+    }
+  };
+
+  open();
+  return () => {
+    closed = true;
+    clearTimeout(retry);
+    if (source) {
+      source.close();
+    }
+  };
+}
+
+// Listings are keyset-paginated; follow X-Next-Cursor until the last page, newest items first
+async function fetchAllPages(path) {
+  const token = localStorage.getItem('token');
+  const items = [];
+  let cursor = null;
+  do {
+    const params = new URLSearchParams({ order: 'desc', limit: '1000' });
+    if (cursor) {
+      params.set('after', cursor);
+    }
+    const response = await fetch(`${API_BASE_URL}${path}?${params}`, {
+      headers: {
+        'Authorization': `Bearer ${token}`
+      }
+    });
+    if (!response.ok) {
+      throw new Error(`${path} returned ${response.status}`);
+    }
+    items.push(...(await response.json()));
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return items;
+}
+
 function App() {
   const [user, setUser] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -342,16 +418,7 @@ function StudentsManagement() {
 
   const fetchStudents = async () => {
     try {
-      const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE_URL}/api/students`, {
-        headers: {
-          'Authorization': `Bearer ${token}`
-        }
-      });
-      if (response.ok) {
-        const data = await response.json();
-        setStudents(data);
-      }
+      setStudents(await fetchAllPages('/api/students'));
     } catch (error) {
       console.error('Error fetching students:', error);
     } finally {
@@ -413,16 +480,7 @@ function InternshipsManagement({ user }) {
 
   const fetchInternships = async () => {
     try {
-      const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE_URL}/api/internships`, {
-        headers: {
-          'Authorization': `Bearer ${token}`
-        }
-      });
-      if (response.ok) {
-        const data = await response.json();
-        setInternships(data);
-      }
+      setInternships(await fetchAllPages('/api/internships'));
     } catch (error) {
       console.error('Error fetching internships:', error);
     } finally {
@@ -487,18 +545,19 @@ function ApplicationsManagement({ user }) {
     fetchApplications();
   }, []);
 
+  useEffect(() => {
+    return subscribeToEvents({
+      application_status: (update) => {
+        setApplications((current) => current.map((application) =>
+          application.id === update.application_id ? { ...application, status: update.status } : application
+        ));
+      }
+    });
+  }, []);
+
   const fetchApplications = async () => {
     try {
-      const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE_URL}/api/applications`, {
-        headers: {
-          'Authorization': `Bearer ${token}`
-        }
-      });
-      if (response.ok) {
-        const data = await response.json();
-        setApplications(data);
-      }
+      setApplications(await fetchAllPages('/api/applications'));
     } catch (error) {
       console.error('Error fetching applications:', error);
     } finally {
@@ -567,18 +626,13 @@ function ReportsManagement({ user }) {
     fetchReports();
   }, []);
 
+  useEffect(() => {
+    return subscribeToEvents({ report_submitted: () => fetchReports() });
+  }, []);
+
   const fetchReports = async () => {
     try {
-      const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE_URL}/api/reports`, {
-        headers: {
-          'Authorization': `Bearer ${token}`
-        }
-      });
-      if (response.ok) {
-        const data = await response.json();
-        setReports(data);
-      }
+      setReports(await fetchAllPages('/api/reports'));
     } catch (error) {
       console.error('Error fetching reports:', error);
     } finally {
@@ -647,18 +701,13 @@ function EvaluationsManagement({ user }) {
     fetchEvaluations();
   }, []);
 
+  useEffect(() => {
+    return subscribeToEvents({ evaluation_created: () => fetchEvaluations() });
+  }, []);
+
   const fetchEvaluations = async () => {
     try {
-      const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE_URL}/api/evaluations`, {
-        headers: {
-          'Authorization': `Bearer ${token}`
-        }
-      });
-      if (response.ok) {
-        const data = await response.json();
-        setEvaluations(data);
-      }
+      setEvaluations(await fetchAllPages('/api/evaluations'));
     } catch (error) {
       console.error('Error fetching evaluations:', error);
     } finally {
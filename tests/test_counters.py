@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+import counters
+from counters import reconcile_counters, reconcile_if_leased
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class Source:
+    """A source collection grouped by student_id."""
+
+    def __init__(self, student_ids):
+        self.student_ids = student_ids
+
+    async def count_documents(self, query):
+        return len(self.student_ids)
+
+    def aggregate(self, pipeline):
+        counts = {}
+        for student_id in self.student_ids:
+            counts[student_id] = counts.get(student_id, 0) + 1
+        return FakeCursor([{"_id": student_id, "count": count} for student_id, count in counts.items()])
+
+
+class Counters:
+    def __init__(self, docs):
+        self.docs = docs
+        self.writes = []
+
+    async def update_one(self, query, update, upsert=False):
+        pass
+
+    def find(self, query, projection=None):
+        return FakeCursor([doc for doc in self.docs if doc["_id"].startswith("student:")])
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes += operations
+
+
+@pytest.fixture
+def db(monkeypatch):
+    async def no_seats(applications, internships):
+        return 0
+
+    monkeypatch.setattr(counters, "sync_seats_taken", no_seats)
+    return SimpleNamespace(
+        users=Source(["a", "b"]),
+        internships=Source([]),
+        applications=Source(["a", "a", "b"]),
+        reports=Source(["a"]),
+        evaluations=Source([]),
+        counters=Counters([
+            {"_id": "student:a", "applications": 2, "reports": 1, "evaluations": 0},
+            {"_id": "student:b", "applications": 5, "reports": 0, "evaluations": 0},
+            {"_id": "student:gone", "applications": 1},
+        ]),
+    )
+
+
+def test_only_drifted_student_counters_are_written(db):
+    asyncio.run(reconcile_counters(db))
+
+    written = {op._filter["_id"]: op._doc["$set"] for op in db.counters.writes}
+    assert written == {
+        "student:b": {"applications": 1, "reports": 0, "evaluations": 0},
+        "student:gone": {"applications": 0, "reports": 0, "evaluations": 0},
+    }
+
+
+def test_reconciliation_is_skipped_without_the_lease(db, monkeypatch):
+    calls = []
+
+    async def lease(db, seconds):
+        return False
+
+    async def reconcile(db):
+        calls.append(db)
+
+    monkeypatch.setattr(counters, "_take_lease", lease)
+    monkeypatch.setattr(counters, "reconcile_counters", reconcile)
+    assert asyncio.run(reconcile_if_leased(db, 300)) is False
+    assert calls == []
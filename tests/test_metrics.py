@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from metrics import MetricsMiddleware, MetricsRegistry, current_request
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    import metrics
+
+    fresh = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", fresh)
+    return fresh
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/export/{chunks}")
+    async def export(chunks: int):
+        async def body():
+            for _ in range(chunks):
+                await asyncio.sleep(0.05)
+                # Stands in for the listener attributing a query issued mid-stream
+                current_request.get().add("getMore", "reports", 0.001)
+                yield b"row\n"
+        return StreamingResponse(body())
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_streaming_response_is_timed_to_its_last_chunk(registry, client):
+    assert client.get("/export/4").status_code == 200
+
+    key = ("GET", "/export/{chunks}")
+    assert registry.latency[key].total >= 0.2
+    assert registry.queries_per_request[key].total == 4
+    assert registry.statuses[("GET", "/export/{chunks}", 200)] == 1
+    assert registry.in_flight == 0
+
+
+def test_errors_and_unmatched_routes_are_counted(registry, client):
+    assert client.get("/boom").status_code == 500
+    assert client.get("/missing").status_code == 404
+
+    assert registry.statuses[("GET", "/boom", 500)] == 1
+    assert registry.statuses[("GET", "unmatched", 404)] == 1
+    assert registry.in_flight == 0
@@ -0,0 +1,135 @@
+import asyncio
+import ipaddress
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+import rate_limit
+from rate_limit import LocalBuckets, RateLimiter, client_ip, parse_limit, parse_networks
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_parse_limit():
+    assert parse_limit("60/60") == (1.0, 60)
+    assert parse_limit("10/300") == (10 / 300, 10)
+    assert parse_limit("5") == (5.0, 5)
+    assert parse_limit("0") == (0.0, 0)
+    assert parse_limit("0/60") == (0.0, 0)
+
+
+def test_parse_limit_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_limit("ten/60")
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    buckets = LocalBuckets()
+    for _ in range(3):
+        assert asyncio.run(buckets.take("k", 1.0, 3)) == 0.0
+    assert asyncio.run(buckets.take("k", 1.0, 3)) == pytest.approx(1.0)
+
+    clock.now += 1.5
+    assert asyncio.run(buckets.take("k", 1.0, 3)) == 0.0
+    assert asyncio.run(buckets.take("k", 1.0, 3)) == pytest.approx(0.5)
+
+
+def test_buckets_are_independent(clock):
+    buckets = LocalBuckets()
+    assert asyncio.run(buckets.take("a", 1.0, 1)) == 0.0
+    assert asyncio.run(buckets.take("b", 1.0, 1)) == 0.0
+    assert asyncio.run(buckets.take("a", 1.0, 1)) > 0
+
+
+def test_refilled_buckets_are_evicted(clock):
+    buckets = LocalBuckets()
+    asyncio.run(buckets.take("a", 1.0, 2))
+    asyncio.run(buckets.take("b", 1.0, 2))
+    clock.now += 0.5
+    asyncio.run(buckets.take("c", 1.0, 2))
+    assert buckets.stats() == {"buckets": 3, "evicted": 0}
+
+    # a and b are full again one second after their take
+    clock.now += 0.6
+    asyncio.run(buckets.take("c", 1.0, 2))
+    assert buckets.stats() == {"buckets": 1, "evicted": 2}
+
+
+def test_touched_bucket_is_not_evicted_first(clock):
+    buckets = LocalBuckets(max_buckets=2)
+    asyncio.run(buckets.take("a", 1.0, 5))
+    asyncio.run(buckets.take("b", 1.0, 5))
+    asyncio.run(buckets.take("a", 1.0, 5))
+    asyncio.run(buckets.take("c", 1.0, 5))
+    assert list(buckets._buckets) == ["a", "c"]
+    assert buckets.evicted == 1
+
+
+def test_evicting_a_full_bucket_forgets_nothing(clock):
+    buckets = LocalBuckets()
+    asyncio.run(buckets.take("a", 1.0, 1))
+    clock.now += 1.0
+    asyncio.run(buckets.take("b", 1.0, 1))
+    assert "a" not in buckets._buckets
+    assert asyncio.run(buckets.take("a", 1.0, 1)) == 0.0
+
+
+def test_limiter_counts_and_rounds_retry_after(clock):
+    limiter = RateLimiter(LocalBuckets())
+    limiter.add_limit("login-ip", *parse_limit("1/10"))
+    assert asyncio.run(limiter.check("login-ip", "1.2.3.4")) is None
+    assert asyncio.run(limiter.check("login-ip", "1.2.3.4")) == 10
+    assert limiter.stats()["allowed"] == 1
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_limiter_ignores_disabled_limits_and_empty_values(clock):
+    limiter = RateLimiter(LocalBuckets())
+    limiter.add_limit("login-ip", *parse_limit("0"))
+    limiter.add_limit("login-user", *parse_limit("1/60"))
+    assert "login-ip" not in limiter.limits
+    for _ in range(3):
+        assert asyncio.run(limiter.check("login-ip", "1.2.3.4")) is None
+        assert asyncio.run(limiter.check("login-user", "")) is None
+
+
+def test_parse_networks():
+    assert parse_networks("") == []
+    assert parse_networks("10.0.0.0/8, 127.0.0.1") == [
+        ipaddress.ip_network("10.0.0.0/8"), ipaddress.ip_network("127.0.0.1/32"),
+    ]
+
+
+def test_client_ip_without_trusted_proxies_uses_peer():
+    assert client_ip("10.0.0.5", ["203.0.113.7"], []) == "10.0.0.5"
+
+
+def test_client_ip_ignores_header_from_untrusted_peer():
+    trusted = parse_networks("10.0.0.0/8")
+    assert client_ip("198.51.100.1", ["203.0.113.7"], trusted) == "198.51.100.1"
+
+
+def test_client_ip_takes_rightmost_untrusted_hop():
+    trusted = parse_networks("10.0.0.0/8")
+    # The client prepended a spoofed address; the ingress appended the real one
+    assert client_ip("10.0.0.5", ["1.1.1.1, 203.0.113.7", "10.0.0.9"], trusted) == "203.0.113.7"
+
+
+def test_client_ip_all_hops_trusted():
+    trusted = parse_networks("10.0.0.0/8")
+    assert client_ip("10.0.0.5", ["10.1.1.1"], trusted) == "10.1.1.1"
+    assert client_ip("10.0.0.5", [], trusted) == "10.0.0.5"
@@ -0,0 +1,311 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+import seats
+from seats import SeatsFull, StatusConflict, change_application_status, change_application_statuses, reserve_seats, sync_seats_taken
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeInternships:
+    """Seat counters keyed by internship id, applying the conditional $inc updates of seats.py."""
+
+    def __init__(self, **internships):
+        self.docs = {i: {"id": i, "seats_taken": taken, "max_students": limit} for i, (taken, limit) in internships.items()}
+
+    async def update_one(self, query, update):
+        doc = self.docs.get(query["id"])
+        if doc is None:
+            return SimpleNamespace(modified_count=0)
+        if "$expr" in query and not doc["seats_taken"] < doc["max_students"]:
+            return SimpleNamespace(modified_count=0)
+        if "seats_taken" in query and not doc["seats_taken"] > 0:
+            return SimpleNamespace(modified_count=0)
+        doc["seats_taken"] += update["$inc"]["seats_taken"]
+        return SimpleNamespace(modified_count=1)
+
+    def taken(self, internship_id):
+        return self.docs[internship_id]["seats_taken"]
+
+
+class FakeApplications:
+    """Applications keyed by id, with compare-and-set on status like the server.
+
+    `before_write` runs just before a write is applied, to play a concurrent request.
+    """
+
+    def __init__(self, docs):
+        self.docs = {doc["id"]: dict(doc) for doc in docs}
+        self.before_write = None
+        self.bulk_writes = 0
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["id"])
+        return dict(doc) if doc else None
+
+    def find(self, query, projection=None):
+        ids, rest = query["id"]["$in"], {k: v for k, v in query.items() if k != "id"}
+        docs = [self.docs[i] for i in ids if i in self.docs]
+        return FakeCursor([dict(doc) for doc in docs if all(doc.get(k) == v for k, v in rest.items())])
+
+    def _apply(self, query, update):
+        doc = self.docs.get(query["id"])
+        if doc is None or doc["status"] != query["status"]:
+            return 0
+        doc.update(update["$set"])
+        return 1
+
+    async def update_one(self, query, update):
+        if self.before_write:
+            self.before_write(self.docs)
+        return SimpleNamespace(modified_count=self._apply(query, update))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_writes += 1
+        if self.before_write:
+            self.before_write(self.docs)
+        return SimpleNamespace(modified_count=sum(self._apply(op._filter, op._doc) for op in operations))
+
+
+def application(application_id, internship_id, status="pending"):
+    return {"id": application_id, "student_id": f"s-{application_id}", "internship_id": internship_id, "status": status}
+
+
+def test_approval_takes_a_seat_and_rejection_returns_it():
+    internships = FakeInternships(i1=(0, 1))
+    applications = FakeApplications([application("a", "i1")])
+
+    previous = asyncio.run(change_application_status(applications, internships, "a", "approved"))
+    assert previous["status"] == "pending"
+    assert internships.taken("i1") == 1
+
+    asyncio.run(change_application_status(applications, internships, "a", "rejected"))
+    assert applications.docs["a"]["status"] == "rejected"
+    assert internships.taken("i1") == 0
+
+
+def test_approving_into_a_full_internship():
+    internships = FakeInternships(i1=(1, 1))
+    applications = FakeApplications([application("a", "i1")])
+
+    with pytest.raises(SeatsFull):
+        asyncio.run(change_application_status(applications, internships, "a", "approved"))
+    assert applications.docs["a"]["status"] == "pending"
+    assert internships.taken("i1") == 1
+
+
+def test_unchanged_and_missing_applications_touch_no_seats():
+    internships = FakeInternships(i1=(0, 1))
+    applications = FakeApplications([application("a", "i1", "approved")])
+
+    assert asyncio.run(change_application_status(applications, internships, "a", "approved"))["status"] == "approved"
+    assert asyncio.run(change_application_status(applications, internships, "missing", "approved")) is None
+    assert internships.taken("i1") == 0
+
+
+def test_lost_compare_and_set_gives_the_seat_back():
+    internships = FakeInternships(i1=(0, 1))
+    applications = FakeApplications([application("a", "i1")])
+
+    def concurrent_reject(docs):
+        docs["a"]["status"] = "rejected"
+
+    applications.before_write = concurrent_reject
+    with pytest.raises(StatusConflict):
+        asyncio.run(change_application_status(applications, internships, "a", "approved"))
+    assert internships.taken("i1") == 0
+
+
+class FakeAggregateApplications:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def aggregate(self, pipeline):
+        return FakeCursor(self.rows)
+
+
+class RecordingInternships:
+    def __init__(self):
+        self.batches = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.batches.append(operations)
+        return SimpleNamespace(modified_count=len(operations))
+
+
+def test_sync_seats_taken_writes_in_chunks():
+    rows = [{"_id": f"i{n}", "approved": n % 3 + 1} for n in range(2500)]
+    internships = RecordingInternships()
+    modified = asyncio.run(sync_seats_taken(FakeAggregateApplications(rows), internships))
+
+    assert modified == 2500
+    assert [len(batch) for batch in internships.batches] == [1000, 1000, 500]
+    first = internships.batches[0][0]
+    assert first._filter == {"id": "i0"}
+    assert first._doc == {"$max": {"seats_taken": 1}}
+
+
+def test_sync_seats_taken_without_approvals_writes_nothing():
+    internships = RecordingInternships()
+    assert asyncio.run(sync_seats_taken(FakeAggregateApplications([]), internships)) == 0
+    assert internships.batches == []
+
+
+class FakeSeats:
+    """Stands in for reserve_seats/release_seats with the same arithmetic on plain dicts."""
+
+    def __init__(self, **internships):
+        self.internships = {i: {"seats_taken": taken, "max_students": limit} for i, (taken, limit) in internships.items()}
+        self.reserve_calls = []
+
+    async def reserve(self, internships, internship_id, wanted):
+        self.reserve_calls.append((internship_id, wanted))
+        doc = self.internships[internship_id]
+        granted = max(min(doc["max_students"], doc["seats_taken"] + wanted) - doc["seats_taken"], 0)
+        doc["seats_taken"] += granted
+        return granted
+
+    async def release(self, internships, internship_id, count):
+        doc = self.internships[internship_id]
+        doc["seats_taken"] = max(doc["seats_taken"] - count, 0)
+
+    def taken(self, internship_id):
+        return self.internships[internship_id]["seats_taken"]
+
+
+@pytest.fixture
+def fake_seats(monkeypatch):
+    fake = FakeSeats(i1=(0, 2), i2=(1, 1))
+    monkeypatch.setattr(seats, "reserve_seats", fake.reserve)
+    monkeypatch.setattr(seats, "release_seats", fake.release)
+    return fake
+
+
+def decide(applications, decisions):
+    decisions = [{"application_id": a, "status": s} for a, s in decisions]
+    return asyncio.run(change_application_statuses(applications, None, decisions))
+
+
+def test_approvals_take_seats_in_request_order(fake_seats):
+    applications = FakeApplications([application("a", "i1"), application("b", "i1"), application("c", "i1")])
+    results = decide(applications, [("a", "approved"), ("b", "approved"), ("c", "approved")])
+
+    assert [r["result"] for r in results] == ["updated", "updated", "full"]
+    assert fake_seats.reserve_calls == [("i1", 3)]
+    assert fake_seats.taken("i1") == 2
+    assert applications.docs["c"]["status"] == "pending"
+    assert applications.bulk_writes == 1
+
+
+def test_rejecting_an_approval_releases_its_seat(fake_seats):
+    applications = FakeApplications([application("a", "i2", "approved")])
+    results = decide(applications, [("a", "rejected")])
+
+    assert results[0]["result"] == "updated"
+    assert results[0]["previous_status"] == "approved"
+    assert results[0]["internship_id"] == "i2"
+    assert fake_seats.taken("i2") == 0
+
+
+def test_invalid_duplicate_missing_and_unchanged_decisions(fake_seats):
+    applications = FakeApplications([application("a", "i1"), application("b", "i1", "rejected"), application("c", "i1")])
+    results = decide(applications, [
+        ("a", "approved"), ("a", "rejected"), ("missing", "approved"), ("b", "rejected"), ("c", "maybe"), ("c", "approved"),
+    ])
+
+    # The first decision for an application wins, even an invalid one
+    assert [r["result"] for r in results] == ["updated", "duplicate", "not_found", "unchanged", "invalid", "duplicate"]
+    assert applications.docs["a"]["status"] == "approved"
+    assert applications.docs["c"]["status"] == "pending"
+
+
+def test_lost_compare_and_set_is_a_conflict_and_returns_the_seat(fake_seats):
+    applications = FakeApplications([application("a", "i1"), application("b", "i1")])
+
+    def concurrent_reject(docs):
+        docs["b"]["status"] = "rejected"
+
+    applications.before_write = concurrent_reject
+    results = decide(applications, [("a", "approved"), ("b", "approved")])
+
+    assert [r["result"] for r in results] == ["updated", "conflict"]
+    assert "previous_status" not in results[1]
+    assert fake_seats.taken("i1") == 1
+
+
+def test_concurrent_approval_of_the_same_application_is_a_conflict(fake_seats):
+    fake_seats.internships["i1"]["max_students"] = 3
+    applications = FakeApplications([application("a", "i1"), application("b", "i1")])
+
+    def concurrent_approve(docs):
+        # Another request approves b with a seat of its own
+        fake_seats.internships["i1"]["seats_taken"] += 1
+        docs["b"].update(status="approved", decision_id="other")
+
+    applications.before_write = concurrent_approve
+    results = decide(applications, [("a", "approved"), ("b", "approved")])
+
+    assert [r["result"] for r in results] == ["updated", "conflict"]
+    # One seat per approved application: ours for a, the other request's for b
+    assert fake_seats.taken("i1") == 2
+
+
+def test_concurrent_rejection_of_the_same_application_releases_once(fake_seats):
+    fake_seats.internships["i1"]["seats_taken"] = 2
+    applications = FakeApplications([application("a", "i1", "approved"), application("b", "i1", "approved")])
+
+    def concurrent_reject(docs):
+        # Another request rejects a and releases its seat
+        fake_seats.internships["i1"]["seats_taken"] -= 1
+        docs["a"].update(status="rejected", decision_id="other")
+
+    applications.before_write = concurrent_reject
+    results = decide(applications, [("a", "rejected")])
+
+    assert results[0]["result"] == "conflict"
+    assert fake_seats.taken("i1") == 1
+
+
+def test_nothing_to_write_skips_bulk_write(fake_seats):
+    applications = FakeApplications([application("a", "i2")])
+    results = decide(applications, [("a", "approved")])
+
+    assert results[0]["result"] == "full"
+    assert applications.bulk_writes == 0
+
+
+class SnapshotInternships:
+    def __init__(self, before):
+        self.before = before
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        return self.before
+
+
+@pytest.mark.parametrize("before, wanted, granted", [
+    ({"seats_taken": 0, "max_students": 3}, 2, 2),
+    ({"seats_taken": 2, "max_students": 3}, 2, 1),
+    ({"seats_taken": 3, "max_students": 3}, 1, 0),
+    ({"max_students": 2}, 5, 2),
+    # Over-allocated before seats were tracked: never grants and never goes negative
+    ({"seats_taken": 4, "max_students": 3}, 1, 0),
+    (None, 1, 0),
+])
+def test_reserve_seats_grants_what_is_left(before, wanted, granted):
+    assert asyncio.run(reserve_seats(SnapshotInternships(before), "i1", wanted)) == granted
@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+from student_import import ImportFileError, iter_batches
+
+
+def rows(data: bytes, filename: str, size: int = 100):
+    return [row for batch in iter_batches(io.BytesIO(data), filename, size) for row in batch]
+
+
+def test_csv_rows_keep_their_line_numbers():
+    data = b"username,email,password,full_name\nalice,a@x,pw,Alice\n\nbob,b@x,pw,Bob\n"
+    assert [number for number, _ in rows(data, "students.csv")] == [2, 4]
+
+
+def test_missing_columns_and_blank_cells_read_as_empty():
+    data = b"username,email,full_name\n  alice  ,,Alice\n"
+    [(_, row)] = rows(data, "students.csv")
+    assert row == {"username": "alice", "email": "", "password": "", "full_name": "Alice", "student_id": ""}
+
+
+def test_batches_are_split_by_size():
+    data = b"username\n" + b"".join(b"user%d\n" % n for n in range(5))
+    batches = list(iter_batches(io.BytesIO(data), "students.csv", 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_unreadable_file():
+    with pytest.raises(ImportFileError):
+        rows(b"not a zip", "students.xlsx")
+
+
+def test_xlsx_rows_are_numbered_by_the_sheet():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["username", "email", "password", "full_name"])
+    sheet.append(["alice", "a@x", "pw", "Alice"])
+    sheet.append([None, None, None, None])
+    sheet.append(["bob", "b@x", "pw", "Bob"])
+    sheet["A7"] = "carol"
+    data = io.BytesIO()
+    workbook.save(data)
+
+    numbered = rows(data.getvalue(), "students.xlsx")
+    assert [(number, row["username"]) for number, row in numbered] == [(2, "alice"), (4, "bob"), (7, "carol")]